@@ -0,0 +1,31 @@
+"""score client game id
+
+Revision ID: 20261019_000002
+Revises: 20260220_000001
+Create Date: 2026-10-19 00:00:02
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_000002"
+down_revision: Union[str, None] = "20260220_000001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("scores", sa.Column("client_game_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_index(
+        "uq_scores_user_id_client_game_id", "scores", ["user_id", "client_game_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_scores_user_id_client_game_id", table_name="scores")
+    op.drop_column("scores", "client_game_id")
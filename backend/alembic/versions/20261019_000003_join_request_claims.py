@@ -0,0 +1,36 @@
+"""join request claims
+
+Revision ID: 20261019_000003
+Revises: 20261019_000002
+Create Date: 2026-10-19 00:00:03
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_000003"
+down_revision: Union[str, None] = "20261019_000002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("join_requests", sa.Column("claimed_by_admin_tg_id", sa.BigInteger(), nullable=True))
+    op.add_column("join_requests", sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_join_requests_pending_queue",
+        "join_requests",
+        ["created_at", "id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_join_requests_pending_queue", table_name="join_requests")
+    op.drop_column("join_requests", "claimed_until")
+    op.drop_column("join_requests", "claimed_by_admin_tg_id")
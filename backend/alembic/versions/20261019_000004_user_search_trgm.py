@@ -0,0 +1,37 @@
+"""user search trigram indexes
+
+Revision ID: 20261019_000004
+Revises: 20261019_000003
+Create Date: 2026-10-19 00:00:04
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_000004"
+down_revision: Union[str, None] = "20261019_000003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ("username", "first_name", "last_name")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in COLUMNS:
+        op.create_index(
+            f"ix_users_{column}_trgm",
+            "users",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for column in COLUMNS:
+        op.drop_index(f"ix_users_{column}_trgm", table_name="users")
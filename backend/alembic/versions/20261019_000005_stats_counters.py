@@ -0,0 +1,50 @@
+"""stats counters
+
+Revision ID: 20261019_000005
+Revises: 20261019_000004
+Create Date: 2026-10-19 00:00:05
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_000005"
+down_revision: Union[str, None] = "20261019_000004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stats_counters",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "name", "key"),
+    )
+
+    # Seed from existing rows; afterwards the API keeps the counters current.
+    today = "(now() AT TIME ZONE 'UTC')::date"
+    op.execute(
+        f"""
+        INSERT INTO stats_counters (day, name, key, value)
+        SELECT {today}, 'users', status::text, count(*) FROM users GROUP BY status
+        UNION ALL
+        SELECT {today}, 'pending_requests', '', count(*) FROM join_requests WHERE status = 'PENDING'
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'games', difficulty::text, count(*)
+        FROM scores GROUP BY 1, 3
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'active_players', difficulty::text, count(DISTINCT user_id)
+        FROM scores GROUP BY 1, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stats_counters")
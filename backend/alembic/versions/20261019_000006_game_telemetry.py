@@ -0,0 +1,48 @@
+"""game telemetry
+
+Revision ID: 20261019_000006
+Revises: 20261019_000005
+Create Date: 2026-10-19 00:00:06
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_000006"
+down_revision: Union[str, None] = "20261019_000005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    difficulty = postgresql.ENUM("easy", "normal", "hard", name="difficulty", create_type=False)
+    op.create_table(
+        "game_telemetry",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("game_id", sa.Uuid(), nullable=False),
+        sa.Column("difficulty", difficulty, nullable=False),
+        sa.Column("died", sa.Boolean(), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("death_ms", sa.Integer(), nullable=True),
+        sa.Column("shots", sa.Integer(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.Column("asteroids_spawned", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_game_telemetry_user_id"), "game_telemetry", ["user_id"], unique=False)
+    op.create_index(op.f("ix_game_telemetry_created_at"), "game_telemetry", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_game_telemetry_created_at"), table_name="game_telemetry")
+    op.drop_index(op.f("ix_game_telemetry_user_id"), table_name="game_telemetry")
+    op.drop_table("game_telemetry")
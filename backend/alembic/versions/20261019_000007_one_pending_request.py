@@ -0,0 +1,49 @@
+"""one pending join request per user
+
+Revision ID: 20261019_000007
+Revises: 20261019_000006
+Create Date: 2026-10-19 00:00:07
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_000007"
+down_revision: Union[str, None] = "20261019_000006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Double-taps may already have left several pending requests for a user: keep the
+    # newest one, reject the rest and take them out of the pending counter.
+    op.execute(
+        """
+        WITH duplicates AS (
+            UPDATE join_requests
+            SET status = 'REJECTED', decision_reason = 'Duplicate request', decided_at = now()
+            WHERE status = 'PENDING'
+              AND id NOT IN (SELECT max(id) FROM join_requests WHERE status = 'PENDING' GROUP BY user_id)
+            RETURNING id
+        )
+        INSERT INTO stats_counters (day, name, key, value)
+        SELECT (now() AT TIME ZONE 'UTC')::date, 'pending_requests', '', -count(*) FROM duplicates
+        HAVING count(*) > 0
+        ON CONFLICT (day, name, key) DO UPDATE SET value = stats_counters.value + excluded.value
+        """
+    )
+    op.create_index(
+        "uq_join_requests_user_pending",
+        "join_requests",
+        ["user_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_join_requests_user_pending", table_name="join_requests")
@@ -1,29 +1,40 @@
+from typing import Any, Dict
+
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import Settings, get_settings
 from app.core.security import TokenError, decode_session_token
-from app.db.session import get_db
+from app.db.session import get_db, open_read_session
 from app.models.user import User
 
 
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db),
-    settings: Settings = Depends(get_settings),
-) -> User:
+def get_session_payload(request: Request, settings: Settings = Depends(get_settings)) -> Dict[str, Any]:
     session_token = request.cookies.get(settings.session_cookie_name)
 
     if not session_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
 
     try:
-        payload = decode_session_token(session_token)
+        return decode_session_token(session_token)
     except TokenError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
 
+
+
+def get_read_db(payload: Dict[str, Any] = Depends(get_session_payload)) -> Session:
+    # A primary connection is checked out only when the request is routed to the primary.
+    user_id = payload.get("sub")
+    yield from open_read_session(int(user_id) if user_id else None)
+
+
+
+def get_current_user(
+    payload: Dict[str, Any] = Depends(get_session_payload),
+    db: Session = Depends(get_db),
+) -> User:
     user_id = payload.get("sub")
     telegram_id = payload.get("telegram_id")
 
@@ -38,3 +49,12 @@ def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token/user mismatch")
 
     return user
+
+
+
+def get_current_reader(
+    payload: Dict[str, Any] = Depends(get_session_payload),
+    db: Session = Depends(get_read_db),
+) -> User:
+    # For read-only routes: looks the user up through the route's read session instead of the primary.
+    return get_current_user(payload, db)
@@ -1,7 +1,13 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+import math
+from typing import Any, Callable, Dict
 
-from app.api.deps import get_current_user
+from fastapi import Depends, Header, HTTPException, Request, status
+
+from app.api.deps import get_current_reader, get_current_user, get_session_payload
+from app.core.admission import get_rate_limiter, load_monitor
 from app.core.config import Settings, get_settings
+from app.db.session import SessionLocal
 from app.models.enums import UserStatus
 from app.models.user import User
 
@@ -14,9 +20,63 @@ def require_approved_user(current_user: User = Depends(get_current_user)) -> Use
 
 
 
+def require_approved_reader(current_user: User = Depends(get_current_reader)) -> User:
+    return require_approved_user(current_user)
+
+
+
 def require_admin_user(
     current_user: User = Depends(get_current_user), settings: Settings = Depends(get_settings)
 ) -> User:
     if current_user.telegram_id not in settings.admin_telegram_ids:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return current_user
+
+
+
+def require_admin_reader(
+    current_user: User = Depends(get_current_reader), settings: Settings = Depends(get_settings)
+) -> User:
+    return require_admin_user(current_user, settings)
+
+
+
+def require_admin_or_internal_token(
+    request: Request,
+    x_internal_token: str = Header(default=""),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    # Operators without a Telegram session (curl from the host) use the bot's internal token.
+    if settings.bot_internal_token and hmac.compare_digest(x_internal_token, settings.bot_internal_token):
+        return
+    payload = get_session_payload(request, settings)
+    with SessionLocal() as db:
+        require_admin_user(get_current_user(payload, db), settings)
+
+
+
+def admission_control(route: str) -> Callable[..., None]:
+    # Runs on the decoded session token only, so throttled and shed calls never reach the database.
+    def dependency(
+        payload: Dict[str, Any] = Depends(get_session_payload), settings: Settings = Depends(get_settings)
+    ) -> None:
+        if load_monitor.overloaded(settings):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, retry later",
+                headers={"Retry-After": str(settings.load_shed_retry_after_seconds)},
+            )
+
+        limiter = get_rate_limiter(route)
+        if limiter is None:
+            return
+
+        retry_after = limiter.acquire(int(payload.get("telegram_id") or 0))
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    return dependency
@@ -1,21 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import desc, select
+from sqlalchemy import desc, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_reader, get_current_user, get_read_db
+from app.api.permissions import admission_control
 from app.core.config import Settings, get_settings
-from app.db.session import get_db
+from app.db.session import get_db, pipeline
 from app.models.enums import JoinRequestStatus, UserStatus
 from app.models.join_request import JoinRequest
 from app.models.user import User
 from app.schemas.access import AccessRequestCreate, AccessRequestInfo, AccessStatusResponse, OkResponse
+from app.services.cache_bus import UserStatusChanged, apply, publish
 from app.services.notifier import notify_admins_about_request
+from app.services.stats import record_status_change
 
 router = APIRouter(prefix="/access", tags=["access"])
 
+requests_table = JoinRequest.__table__
+users_table = User.__table__
+
 
 @router.get("/status", response_model=AccessStatusResponse)
-def get_access_status(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> AccessStatusResponse:
+def get_access_status(current_user: User = Depends(get_current_reader), db: Session = Depends(get_read_db)) -> AccessStatusResponse:
     latest_request = db.scalar(
         select(JoinRequest)
         .where(JoinRequest.user_id == current_user.id)
@@ -35,7 +42,7 @@ def get_access_status(current_user: User = Depends(get_current_user), db: Sessio
     return AccessStatusResponse(status=current_user.status, request=request_info)
 
 
-@router.post("/request", response_model=OkResponse)
+@router.post("/request", response_model=OkResponse, dependencies=[Depends(admission_control("access_request"))])
 def create_access_request(
     payload: AccessRequestCreate,
     db: Session = Depends(get_db),
@@ -45,27 +52,44 @@ def create_access_request(
     if current_user.status == UserStatus.APPROVED:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="User already approved")
 
-    pending_request = db.scalar(
-        select(JoinRequest)
-        .where(JoinRequest.user_id == current_user.id, JoinRequest.status == JoinRequestStatus.PENDING)
-        .limit(1)
+    # uq_join_requests_user_pending allows one pending request per user, so of concurrent
+    # double-taps exactly one inserts; the others find no row to update the user from.
+    created = (
+        pg_insert(requests_table)
+        .values(user_id=current_user.id, status=JoinRequestStatus.PENDING, comment=payload.comment)
+        .on_conflict_do_nothing(
+            index_elements=[requests_table.c.user_id],
+            index_where=requests_table.c.status == JoinRequestStatus.PENDING,
+        )
+        .returning(requests_table.c.id, requests_table.c.user_id, requests_table.c.comment)
+        .cte("created")
     )
-    if pending_request:
+    previous = users_table.alias("previous")
+    request = db.execute(
+        update(users_table)
+        .where(users_table.c.id == created.c.user_id, previous.c.id == users_table.c.id)
+        .values(status=UserStatus.REQUESTED, updated_at=func.now())
+        .returning(
+            created.c.id.label("request_id"),
+            created.c.comment,
+            previous.c.status.label("previous_status"),
+            users_table.c.telegram_id,
+            users_table.c.username,
+            users_table.c.first_name,
+            users_table.c.last_name,
+        )
+    ).one_or_none()
+    if request is None:
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Pending request already exists")
 
-    join_request = JoinRequest(
-        user_id=current_user.id,
-        status=JoinRequestStatus.PENDING,
-        comment=payload.comment,
-    )
-    db.add(join_request)
-
-    current_user.status = UserStatus.REQUESTED
-
+    event = UserStatusChanged(current_user.id, UserStatus.REQUESTED)
+    with pipeline(db):
+        record_status_change(db, request.previous_status, UserStatus.REQUESTED, pending_delta=1)
+        publish(db, event)
     db.commit()
-    db.refresh(join_request)
-    db.refresh(current_user)
+    apply(event)
 
-    notify_admins_about_request(settings, current_user, join_request)
+    notify_admins_about_request(settings, request)
 
     return OkResponse(ok=True)
@@ -1,32 +1,61 @@
-from datetime import UTC, datetime
+from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import desc, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, case, desc, func, literal, null, or_, select, true, update
 from sqlalchemy.orm import Session
 
-from app.api.permissions import require_admin_user
-from app.db.session import get_db
-from app.models.enums import JoinRequestStatus, UserStatus
+from app.api.deps import get_read_db
+from app.api.permissions import require_admin_reader, require_admin_user
+from app.core.config import Settings, get_settings
+from app.db.session import get_db, mark_recent_write
+from app.models.enums import Difficulty, JoinRequestStatus, UserStatus
 from app.models.join_request import JoinRequest
+from app.models.stats_counter import StatsCounter
 from app.models.user import User
 from app.schemas.access import OkResponse
-from app.schemas.admin import AdminDecisionRequest, AdminRequestItem, AdminUserItem
+from app.schemas.admin import (
+    AdminDecisionRequest,
+    AdminOverviewResponse,
+    AdminRequestItem,
+    AdminSearchItem,
+    AdminUserItem,
+    OverviewDay,
+)
+from app.services.cache_bus import UserStatusChanged, apply, publish
+from app.services.stats import DAILY, GAUGES, PENDING_REQUESTS, USERS, record_status_change, utc_today
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Multi-table UPDATE ... RETURNING statements below run against Core tables: ORM-enabled
+# updates cannot return columns of other tables or feed a RETURNING CTE.
+requests_table = JoinRequest.__table__
+users_table = User.__table__
+
+# Each has a pg_trgm GIN index, so substring matches do not scan the table.
+SEARCH_COLUMNS = (User.username, User.first_name, User.last_name)
+MAX_TELEGRAM_ID = 2**63 - 1
+# Shorter terms have no trigrams, so the GIN indexes cannot narrow them and every user would be scored.
+MIN_NAME_SEARCH_LENGTH = 3
+
 
 @router.get("/requests", response_model=list[AdminRequestItem])
 def list_requests(
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(require_admin_user),
+    request_status: JoinRequestStatus | None = Query(default=None, alias="status"),
+    limit: int = Query(default=50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    admin_user: User = Depends(require_admin_reader),
 ) -> list[AdminRequestItem]:
     del admin_user
 
-    rows = db.execute(
+    query = (
         select(JoinRequest, User)
         .join(User, User.id == JoinRequest.user_id)
         .order_by(desc(JoinRequest.created_at), desc(JoinRequest.id))
-    ).all()
+        .limit(limit)
+    )
+    if request_status is not None:
+        query = query.where(JoinRequest.status == request_status)
+    rows = db.execute(query).all()
 
     return [
         AdminRequestItem(
@@ -39,36 +68,146 @@ def list_requests(
             username=user.username,
             first_name=user.first_name,
             last_name=user.last_name,
+            claimed_by_admin_tg_id=req.claimed_by_admin_tg_id,
+            claimed_until=req.claimed_until,
         )
         for req, user in rows
     ]
 
 
-@router.post("/requests/{request_id}/approve", response_model=OkResponse)
-def approve_request(
-    request_id: int,
-    payload: AdminDecisionRequest,
+@router.post("/requests/claim", response_model=list[AdminRequestItem])
+def claim_requests(
+    n: int = Query(default=5, ge=1, le=50),
     db: Session = Depends(get_db),
     admin_user: User = Depends(require_admin_user),
-) -> OkResponse:
-    req = db.scalar(select(JoinRequest).where(JoinRequest.id == request_id))
-    if req is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
-    if req.status != JoinRequestStatus.PENDING:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request already decided")
+    settings: Settings = Depends(get_settings),
+) -> list[AdminRequestItem]:
+    now = func.now()
+    claimable = (
+        select(JoinRequest.id)
+        .where(
+            JoinRequest.status == JoinRequestStatus.PENDING,
+            or_(
+                JoinRequest.claimed_until.is_(None),
+                JoinRequest.claimed_until < now,
+                JoinRequest.claimed_by_admin_tg_id == admin_user.telegram_id,
+            ),
+        )
+        .order_by(JoinRequest.created_at, JoinRequest.id)
+        .limit(n)
+        .with_for_update(skip_locked=True)
+    )
+
+    rows = db.execute(
+        update(requests_table)
+        .where(requests_table.c.id.in_(claimable.scalar_subquery()), users_table.c.id == requests_table.c.user_id)
+        .values(
+            claimed_by_admin_tg_id=admin_user.telegram_id,
+            claimed_until=now + timedelta(seconds=settings.admin_claim_lease_seconds),
+        )
+        .returning(
+            requests_table.c.id,
+            requests_table.c.created_at,
+            requests_table.c.status,
+            requests_table.c.comment,
+            requests_table.c.decision_reason,
+            requests_table.c.claimed_by_admin_tg_id,
+            requests_table.c.claimed_until,
+            users_table.c.telegram_id,
+            users_table.c.username,
+            users_table.c.first_name,
+            users_table.c.last_name,
+        )
+    ).all()
+    db.commit()
 
-    user = db.scalar(select(User).where(User.id == req.user_id))
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return sorted(
+        (
+            AdminRequestItem(
+                request_id=row.id,
+                created_at=row.created_at,
+                status=row.status,
+                comment=row.comment,
+                decision_reason=row.decision_reason,
+                telegram_id=row.telegram_id,
+                username=row.username,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                claimed_by_admin_tg_id=row.claimed_by_admin_tg_id,
+                claimed_until=row.claimed_until,
+            )
+            for row in rows
+        ),
+        key=lambda item: (item.created_at, item.request_id),
+    )
 
-    req.status = JoinRequestStatus.APPROVED
-    req.decision_reason = payload.reason
-    req.decided_by_admin_tg_id = admin_user.telegram_id
-    req.decided_at = datetime.now(UTC)
 
-    user.status = UserStatus.APPROVED
+def _decide_request(
+    db: Session,
+    request_id: int,
+    payload: AdminDecisionRequest,
+    admin_user: User,
+    decision: JoinRequestStatus,
+    user_status: UserStatus,
+) -> None:
+    now = func.now()
+    decided = (
+        update(requests_table)
+        .where(
+            requests_table.c.id == request_id,
+            requests_table.c.status == JoinRequestStatus.PENDING,
+            or_(
+                requests_table.c.claimed_until.is_(None),
+                requests_table.c.claimed_until < now,
+                requests_table.c.claimed_by_admin_tg_id == admin_user.telegram_id,
+            ),
+        )
+        .values(
+            status=decision,
+            decision_reason=payload.reason,
+            decided_by_admin_tg_id=admin_user.telegram_id,
+            decided_at=now,
+            claimed_until=None,
+        )
+        .returning(requests_table.c.user_id)
+        .cte("decided")
+    )
+    # Joining the statement snapshot of the user row exposes its status before the update.
+    previous = users_table.alias("previous")
+    # Request and user are updated by one statement; the lookup below only runs on failure.
+    row = db.execute(
+        update(users_table)
+        .where(users_table.c.id == decided.c.user_id, previous.c.id == users_table.c.id)
+        .values(status=user_status, updated_at=now)
+        .returning(users_table.c.id, previous.c.status)
+    ).one_or_none()
+
+    if row is None:
+        db.rollback()
+        req = db.scalar(select(JoinRequest).where(JoinRequest.id == request_id))
+        if req is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
+        if req.status != JoinRequestStatus.PENDING:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request already decided")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request is claimed by another admin")
 
+    user_id, previous_status = row
+    record_status_change(db, previous_status, user_status, pending_delta=-1)
+    event = UserStatusChanged(user_id, user_status)
+    publish(db, event)
     db.commit()
+    mark_recent_write(admin_user.id)
+    apply(event)
+
+
+@router.post("/requests/{request_id}/approve", response_model=OkResponse)
+def approve_request(
+    request_id: int,
+    payload: AdminDecisionRequest,
+    db: Session = Depends(get_db),
+    admin_user: User = Depends(require_admin_user),
+) -> OkResponse:
+    _decide_request(db, request_id, payload, admin_user, JoinRequestStatus.APPROVED, UserStatus.APPROVED)
     return OkResponse(ok=True)
 
 
@@ -79,31 +218,14 @@ def reject_request(
     db: Session = Depends(get_db),
     admin_user: User = Depends(require_admin_user),
 ) -> OkResponse:
-    req = db.scalar(select(JoinRequest).where(JoinRequest.id == request_id))
-    if req is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Request not found")
-    if req.status != JoinRequestStatus.PENDING:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request already decided")
-
-    user = db.scalar(select(User).where(User.id == req.user_id))
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-
-    req.status = JoinRequestStatus.REJECTED
-    req.decision_reason = payload.reason
-    req.decided_by_admin_tg_id = admin_user.telegram_id
-    req.decided_at = datetime.now(UTC)
-
-    user.status = UserStatus.REJECTED
-
-    db.commit()
+    _decide_request(db, request_id, payload, admin_user, JoinRequestStatus.REJECTED, UserStatus.REJECTED)
     return OkResponse(ok=True)
 
 
 @router.get("/users", response_model=list[AdminUserItem])
 def list_users(
-    db: Session = Depends(get_db),
-    admin_user: User = Depends(require_admin_user),
+    db: Session = Depends(get_read_db),
+    admin_user: User = Depends(require_admin_reader),
 ) -> list[AdminUserItem]:
     del admin_user
 
@@ -120,3 +242,104 @@ def list_users(
         )
         for user in users
     ]
+
+
+@router.get("/search", response_model=list[AdminSearchItem])
+def search_users(
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    admin_user: User = Depends(require_admin_reader),
+) -> list[AdminSearchItem]:
+    del admin_user
+
+    term = q.strip().removeprefix("@")
+    conditions = []
+    relevance = literal(0.0)
+    if len(term) >= MIN_NAME_SEARCH_LENGTH:
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions = [column.ilike(pattern) for column in SEARCH_COLUMNS]
+        # similarity() is NULL for NULL columns and greatest() skips NULLs.
+        relevance = func.greatest(*(func.similarity(column, term) for column in SEARCH_COLUMNS))
+    if term.isdigit() and int(term) <= MAX_TELEGRAM_ID:
+        conditions.append(User.telegram_id == int(term))
+        relevance = case((User.telegram_id == int(term), literal(2.0)), else_=relevance)
+    if not conditions:
+        return []
+
+    latest_request = (
+        select(JoinRequest.id, JoinRequest.status)
+        .where(JoinRequest.user_id == User.id)
+        .order_by(desc(JoinRequest.created_at), desc(JoinRequest.id))
+        .limit(1)
+        .lateral("latest_request")
+    )
+    rows = db.execute(
+        select(User, latest_request.c.id.label("request_id"), latest_request.c.status.label("request_status"))
+        .outerjoin(latest_request, true())
+        .where(or_(*conditions))
+        .order_by(relevance.desc(), desc(User.created_at))
+        .limit(limit)
+    ).all()
+
+    return [
+        AdminSearchItem(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            status=user.status,
+            created_at=user.created_at,
+            request_id=request_id,
+            request_status=request_status,
+        )
+        for user, request_id, request_status in rows
+    ]
+
+
+@router.get("/overview", response_model=AdminOverviewResponse)
+def get_overview(
+    days: int = Query(default=14, ge=1, le=366),
+    db: Session = Depends(get_read_db),
+    admin_user: User = Depends(require_admin_reader),
+) -> AdminOverviewResponse:
+    del admin_user
+
+    # Gauges collapse to one total across all day buckets; daily counters keep their day.
+    bucket = case((StatsCounter.name.in_(GAUGES), null()), else_=StatsCounter.day).label("bucket")
+    rows = db.execute(
+        select(StatsCounter.name, StatsCounter.key, bucket, func.sum(StatsCounter.value))
+        .where(
+            or_(
+                StatsCounter.name.in_(GAUGES),
+                and_(StatsCounter.name.in_(DAILY), StatsCounter.day > utc_today() - days),
+            )
+        )
+        .group_by(StatsCounter.name, StatsCounter.key, bucket)
+    ).all()
+
+    users_by_status = {item: 0 for item in UserStatus}
+    pending_requests = 0
+    per_day: dict[date, OverviewDay] = {}
+    for name, key, day, value in rows:
+        if name == USERS:
+            users_by_status[UserStatus(key)] = int(value)
+        elif name == PENDING_REQUESTS:
+            pending_requests = int(value)
+        else:
+            entry = per_day.setdefault(
+                day,
+                OverviewDay(
+                    day=day,
+                    games={item: 0 for item in Difficulty},
+                    active_players={item: 0 for item in Difficulty},
+                ),
+            )
+            getattr(entry, name)[Difficulty(key)] = int(value)
+
+    return AdminOverviewResponse(
+        pending_requests=pending_requests,
+        users_by_status=users_by_status,
+        days=sorted(per_day.values(), key=lambda item: item.day, reverse=True),
+    )
@@ -1,19 +1,36 @@
-from fastapi import APIRouter, Depends, Response
+import time
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.deps import get_current_user, get_session_payload
 from app.core.config import Settings, get_settings
 from app.core.security import create_session_token
-from app.db.session import get_db
+from app.db.session import get_db, mark_recent_write
 from app.models.enums import UserStatus
 from app.models.user import User
 from app.schemas.auth import TelegramAuthRequest, TelegramAuthResponse
 from app.schemas.common import UserOut
+from app.services.stats import record_new_user
 from app.services.telegram_webapp import verify_telegram_init_data
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def set_session_cookie(response: Response, settings: Settings, token: str) -> None:
+    response.set_cookie(
+        key=settings.session_cookie_name,
+        value=token,
+        httponly=True,
+        secure=settings.session_cookie_secure,
+        samesite="lax",
+        max_age=settings.jwt_expire_hours * 3600,
+        path="/",
+    )
+
+
 @router.post("/telegram", response_model=TelegramAuthResponse)
 def auth_telegram(
     payload: TelegramAuthRequest,
@@ -36,6 +53,7 @@ def auth_telegram(
             status=UserStatus.NEW,
         )
         db.add(user)
+        record_new_user(db)
     else:
         user.username = tg_user.get("username")
         user.first_name = tg_user.get("first_name", user.first_name)
@@ -44,21 +62,34 @@ def auth_telegram(
 
     db.commit()
     db.refresh(user)
+    mark_recent_write(user.id)
 
     token = create_session_token(user.id, user.telegram_id)
-
-    response.set_cookie(
-        key=settings.session_cookie_name,
-        value=token,
-        httponly=True,
-        secure=settings.session_cookie_secure,
-        samesite="lax",
-        max_age=settings.jwt_expire_hours * 3600,
-        path="/",
-    )
+    set_session_cookie(response, settings, token)
 
     return TelegramAuthResponse(
         user=UserOut.model_validate(user),
         status=user.status,
         is_admin=user.telegram_id in settings.admin_telegram_ids,
     )
+
+
+@router.post("/refresh", response_model=TelegramAuthResponse)
+def refresh_session(
+    response: Response,
+    payload: Dict[str, Any] = Depends(get_session_payload),
+    current_user: User = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+) -> TelegramAuthResponse:
+    auth_time = payload.get("auth_time")
+    if not isinstance(auth_time, int) or time.time() - auth_time > settings.session_max_age_hours * 3600:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session renewal window expired")
+
+    token = create_session_token(current_user.id, current_user.telegram_id, auth_time=auth_time)
+    set_session_cookie(response, settings, token)
+
+    return TelegramAuthResponse(
+        user=UserOut.model_validate(current_user),
+        status=current_user.status,
+        is_admin=current_user.telegram_id in settings.admin_telegram_ids,
+    )
@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import desc, exists, false, func, literal_column, or_, select, true, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.api.routers.auth import set_session_cookie
+from app.core.config import Settings, get_settings
+from app.core.security import create_session_token
+from app.db.session import get_db, mark_recent_write
+from app.models.enums import Difficulty, UserStatus
+from app.models.join_request import JoinRequest
+from app.models.user import User
+from app.schemas.access import AccessRequestInfo, AccessStatusResponse
+from app.schemas.bootstrap import BootstrapRequest, BootstrapResponse
+from app.schemas.common import UserOut
+from app.services.cache_bus import UserProfileChanged, apply, publish
+from app.services.leaderboard import fetch_leaderboards
+from app.services.stats import record_new_user
+from app.services.telegram_webapp import verify_telegram_init_data
+
+router = APIRouter(tags=["bootstrap"])
+
+
+@router.post("/bootstrap", response_model=BootstrapResponse)
+def bootstrap(
+    payload: BootstrapRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+) -> BootstrapResponse:
+    tg_user = verify_telegram_init_data(payload.initData, settings.bot_token, settings.webapp_auth_max_age_seconds)
+
+    insert_stmt = pg_insert(User).values(
+        telegram_id=tg_user["id"],
+        username=tg_user.get("username"),
+        first_name=tg_user.get("first_name", "Unknown"),
+        last_name=tg_user.get("last_name"),
+        photo_url=tg_user.get("photo_url"),
+        status=UserStatus.NEW,
+    )
+    profile = {
+        "username": insert_stmt.excluded.username,
+        "first_name": insert_stmt.excluded.first_name if "first_name" in tg_user else User.first_name,
+        "last_name": insert_stmt.excluded.last_name,
+        "photo_url": insert_stmt.excluded.photo_url,
+    }
+    user_columns = (User.id, User.telegram_id, User.username, User.first_name, User.last_name, User.photo_url, User.status)
+    upserted = (
+        insert_stmt.on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            set_={**profile, "updated_at": func.now()},
+            # Unchanged profiles (most launches) are left alone: no dead tuple, no WAL.
+            where=or_(*(getattr(User, column).is_distinct_from(value) for column, value in profile.items())),
+        )
+        .returning(
+            *user_columns,
+            # xmax is 0 only for a freshly inserted row, not for one updated on conflict.
+            literal_column("xmax = 0").label("inserted"),
+        )
+        .cte("upserted")
+    )
+    # The skipped update returns nothing, so fall back to the existing row.
+    user_row = union_all(
+        select(upserted, true().label("written")),
+        select(*user_columns, false().label("inserted"), false().label("written")).where(
+            User.telegram_id == tg_user["id"], ~exists(select(upserted.c.id))
+        ),
+    ).subquery("user_row")
+    latest_request = (
+        select(JoinRequest.id, JoinRequest.status, JoinRequest.comment, JoinRequest.decision_reason)
+        .where(JoinRequest.user_id == user_row.c.id)
+        .order_by(desc(JoinRequest.created_at), desc(JoinRequest.id))
+        .limit(1)
+        .lateral("latest_request")
+    )
+
+    # User upsert and latest join request in one round trip.
+    query = select(
+        user_row,
+        latest_request.c.id.label("request_id"),
+        latest_request.c.status.label("request_status"),
+        latest_request.c.comment.label("request_comment"),
+        latest_request.c.decision_reason.label("request_decision_reason"),
+    ).select_from(user_row.outerjoin(latest_request, true()))
+    row = db.execute(query).one_or_none()
+    if row is None:
+        # A concurrent first bootstrap inserted the same user after this statement's snapshot was taken.
+        row = db.execute(query).one()
+
+    user = UserOut.model_validate(row._mapping)
+    # Renames reach live leaderboards in every worker.
+    event = UserProfileChanged(user.id) if row.written and not row.inserted else None
+    if row.inserted:
+        record_new_user(db)
+    if event is not None:
+        publish(db, event)
+    leaderboards = fetch_leaderboards(db, Difficulty) if user.status == UserStatus.APPROVED else {}
+    db.commit()
+    if event is not None:
+        apply(event)
+    elif row.inserted:
+        mark_recent_write(user.id)
+
+    request_info = None
+    if row.request_id is not None:
+        request_info = AccessRequestInfo(
+            id=row.request_id,
+            status=row.request_status,
+            comment=row.request_comment,
+            decision_reason=row.request_decision_reason,
+        )
+
+    token = create_session_token(user.id, user.telegram_id)
+    set_session_cookie(response, settings, token)
+
+    return BootstrapResponse(
+        user=user,
+        status=user.status,
+        is_admin=user.telegram_id in settings.admin_telegram_ids,
+        access=AccessStatusResponse(status=user.status, request=request_info),
+        leaderboards=leaderboards,
+    )
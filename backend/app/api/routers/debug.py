@@ -0,0 +1,31 @@
+import asyncio
+import os
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from app.api.permissions import require_admin_or_internal_token
+from app.core.profiler import ProfilerBusy, profiler, to_collapsed, to_speedscope
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_admin_or_internal_token)])
+
+
+@router.get("/profile")
+async def profile_worker(
+    seconds: float = Query(default=10, gt=0, le=60),
+    interval_ms: float = Query(default=10, ge=1, le=1000),
+    format: Literal["collapsed", "speedscope"] = Query(default="collapsed"),
+    idle: bool = Query(default=False),
+) -> Response:
+    # Profiles only the worker process that happens to serve this request.
+    try:
+        stacks, ticks = await asyncio.to_thread(profiler.run, seconds, interval_ms / 1000, idle)
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+    headers = {"X-Profile-Pid": str(os.getpid()), "X-Profile-Ticks": str(ticks)}
+    if format == "collapsed":
+        return PlainTextResponse(to_collapsed(stacks), headers=headers)
+    headers["Content-Disposition"] = f'attachment; filename="profile-{os.getpid()}.speedscope.json"'
+    return JSONResponse(to_speedscope(stacks, interval_ms / 1000, f"pid {os.getpid()}, {seconds:g}s"), headers=headers)
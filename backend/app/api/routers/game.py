@@ -1,74 +1,256 @@
-from sqlalchemy import and_, desc, func, select
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import logging
+from contextlib import suppress
+
+from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, WebSocket, status
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from app.api.permissions import require_approved_user
-from app.db.session import get_db
-from app.models.enums import Difficulty, UserStatus
+from app.api.deps import get_current_user, get_read_db, get_session_payload
+from app.api.permissions import admission_control, require_approved_reader, require_approved_user
+from app.core.config import Settings, get_settings
+from app.db.session import SessionLocal, get_db, pipeline
+from app.models.enums import Difficulty
 from app.models.score import Score
 from app.models.user import User
-from app.schemas.access import OkResponse
-from app.schemas.game import LeaderboardEntry, ScoreCreate
+from app.schemas.game import (
+    MAX_SCORE,
+    HistogramBucket,
+    HistogramResponse,
+    LeaderboardEntry,
+    PercentileResponse,
+    PlayerRankResponse,
+    RankedEntry,
+    ScoreCreate,
+    ScoreSubmitResponse,
+    TelemetryResponse,
+)
+from app.services.cache_bus import LeaderboardChanged, apply, publish
+from app.services.leaderboard import fetch_leaderboards
+from app.services.live_leaderboard import Subscriber, live_leaderboards
+from app.services.rank_index import histogram_edges, leaderboard_index
+from app.services.score_dedup import recent_games
+from app.services.stats import record_game
+from app.services.telemetry import TelemetryError, append_batch, decode_batch
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/game", tags=["game"])
 
 
-@router.post("/score", response_model=OkResponse)
+@router.post("/score", response_model=ScoreSubmitResponse, dependencies=[Depends(admission_control("score"))])
 def submit_score(
     payload: ScoreCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_approved_user),
-) -> OkResponse:
-    db.add(Score(user_id=current_user.id, difficulty=payload.difficulty, score=payload.score))
+) -> ScoreSubmitResponse:
+    game_key = (current_user.id, payload.game_id)
+    if payload.game_id is not None and recent_games.seen(game_key):
+        return ScoreSubmitResponse(ok=True, duplicate=True)
+
+    score_id = db.scalar(
+        pg_insert(Score)
+        .values(
+            user_id=current_user.id,
+            difficulty=payload.difficulty,
+            score=payload.score,
+            client_game_id=payload.game_id,
+        )
+        .on_conflict_do_nothing(index_elements=[Score.user_id, Score.client_game_id])
+        .returning(Score.id)
+    )
+    if score_id is not None:
+        event = LeaderboardChanged(payload.difficulty, current_user.id, payload.score)
+        with pipeline(db):
+            publish(db, event)
+            record_game(db, score_id, current_user.id, payload.difficulty)
+    db.commit()
+
+    if payload.game_id is not None:
+        recent_games.add(game_key)
+    if score_id is None:
+        return ScoreSubmitResponse(ok=True, duplicate=True)
+
+    apply(event)
+    return ScoreSubmitResponse(ok=True)
+
+
+@router.post(
+    "/telemetry", response_model=TelemetryResponse, dependencies=[Depends(admission_control("telemetry"))]
+)
+def submit_telemetry(
+    data: bytes = Body(media_type="application/octet-stream"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_approved_user),
+    settings: Settings = Depends(get_settings),
+) -> TelemetryResponse:
+    try:
+        accepted = append_batch(db, current_user.id, decode_batch(data, settings.telemetry_max_records))
+    except TelemetryError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     db.commit()
-    return OkResponse(ok=True)
+    return TelemetryResponse(accepted=accepted)
 
 
 @router.get("/leaderboard", response_model=list[LeaderboardEntry])
 def get_leaderboard(
     difficulty: Difficulty = Query(default=Difficulty.EASY),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_approved_user),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_approved_reader),
 ) -> list[LeaderboardEntry]:
     del current_user
 
-    ranked_scores = (
-        select(
-            Score.user_id,
-            func.max(Score.score).label("best_score"),
-        )
-        .join(User, User.id == Score.user_id)
-        .where(and_(Score.difficulty == difficulty, User.status == UserStatus.APPROVED))
-        .group_by(Score.user_id)
-        .subquery()
-    )
+    return fetch_leaderboards(db, [difficulty])[difficulty]
 
-    query = (
-        select(
-            User.id,
-            User.telegram_id,
-            User.username,
-            User.first_name,
-            ranked_scores.c.best_score,
-            func.max(Score.created_at).label("achieved_at"),
-        )
-        .join(ranked_scores, ranked_scores.c.user_id == User.id)
-        .join(Score, and_(Score.user_id == User.id, Score.score == ranked_scores.c.best_score, Score.difficulty == difficulty))
-        .group_by(User.id, User.telegram_id, User.username, User.first_name, ranked_scores.c.best_score)
-        .order_by(desc(ranked_scores.c.best_score), User.id)
-        .limit(10)
+
+def _authenticate_approved(websocket: WebSocket, settings: Settings) -> None:
+    # A short-lived session: the connection itself may stay open for hours.
+    payload = get_session_payload(websocket, settings)
+    with SessionLocal() as db:
+        require_approved_user(get_current_user(payload, db))
+
+
+async def _send_updates(websocket: WebSocket, subscriber: Subscriber, timeout: float) -> None:
+    while (message := await subscriber.next()) is not None:
+        async with asyncio.timeout(timeout):
+            await websocket.send_text(message)
+
+
+async def _drain_client(websocket: WebSocket) -> None:
+    # Clients send nothing; reading is how a disconnect is noticed.
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/leaderboard/live")
+async def live_leaderboard(
+    websocket: WebSocket,
+    difficulty: Difficulty = Query(default=Difficulty.EASY),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    try:
+        await asyncio.to_thread(_authenticate_approved, websocket, settings)
+    except HTTPException as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc.detail))
+        return
+    if not leaderboard_index.ready or live_leaderboards.connections >= settings.live_leaderboard_max_connections:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Live leaderboard is not available")
+        return
+
+    await websocket.accept()
+    try:
+        subscriber = await live_leaderboards.subscribe(difficulty)
+    except Exception:
+        logger.exception("Failed to subscribe to the live %s leaderboard", difficulty.value)
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    sender = asyncio.create_task(
+        _send_updates(websocket, subscriber, settings.live_leaderboard_send_timeout_seconds)
     )
+    receiver = asyncio.create_task(_drain_client(websocket))
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Not awaited: this also runs when the endpoint itself is being cancelled.
+        sender.cancel()
+        receiver.cancel()
+        live_leaderboards.unsubscribe(difficulty, subscriber)
+    for task in done:
+        # Send timeouts and disconnects end the session alike; mark them retrieved.
+        task.exception()
+
+    if receiver not in done:
+        # Dropped for falling behind, or a send timed out; the client reconnects for a fresh snapshot.
+        with suppress(Exception):
+            await asyncio.wait_for(websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too slow"), 1)
 
-    result = db.execute(query).all()
+
+def _require_rank_index() -> None:
+    if not leaderboard_index.ready:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Rank index is not available")
+
+
+@router.get("/rank", response_model=PlayerRankResponse, dependencies=[Depends(_require_rank_index)])
+def get_player_rank(
+    difficulty: Difficulty = Query(default=Difficulty.EASY),
+    current_user: User = Depends(require_approved_user),
+) -> PlayerRankResponse:
+    rank, score, total_players = leaderboard_index.rank_of(difficulty, current_user.id)
+    return PlayerRankResponse(difficulty=difficulty, rank=rank, score=score, total_players=total_players)
+
+
+@router.get("/ranking", response_model=list[RankedEntry], dependencies=[Depends(_require_rank_index)])
+def get_ranking(
+    difficulty: Difficulty = Query(default=Difficulty.EASY),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=10, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_approved_reader),
+) -> list[RankedEntry]:
+    del current_user
+
+    entries = leaderboard_index.range(difficulty, offset, limit)
+    if not entries:
+        return []
+
+    users = {
+        row.id: row
+        for row in db.execute(
+            select(User.id, User.telegram_id, User.username, User.first_name).where(
+                User.id.in_([user_id for _, user_id, _ in entries])
+            )
+        )
+    }
 
     return [
-        LeaderboardEntry(
-            user_id=row.id,
-            telegram_id=row.telegram_id,
-            username=row.username,
-            first_name=row.first_name,
-            score=int(row.best_score),
-            achieved_at=row.achieved_at,
+        RankedEntry(
+            rank=rank,
+            user_id=user_id,
+            telegram_id=users[user_id].telegram_id,
+            username=users[user_id].username,
+            first_name=users[user_id].first_name,
+            score=score,
         )
-        for row in result
+        for rank, user_id, score in entries
+        if user_id in users
     ]
+
+
+@router.get("/percentile", response_model=PercentileResponse, dependencies=[Depends(_require_rank_index)])
+def get_percentile(
+    score: int = Query(ge=0, le=MAX_SCORE),
+    difficulty: Difficulty = Query(default=Difficulty.EASY),
+    current_user: User = Depends(require_approved_user),
+) -> PercentileResponse:
+    del current_user
+
+    players_below, total_players = leaderboard_index.percentile(difficulty, score)
+    return PercentileResponse(
+        difficulty=difficulty,
+        score=score,
+        players_below=players_below,
+        total_players=total_players,
+        percentile=round(100 * players_below / total_players, 1) if total_players else 0.0,
+    )
+
+
+@router.get("/histogram", response_model=HistogramResponse, dependencies=[Depends(_require_rank_index)])
+def get_histogram(
+    difficulty: Difficulty = Query(default=Difficulty.EASY),
+    current_user: User = Depends(require_approved_user),
+    settings: Settings = Depends(get_settings),
+) -> HistogramResponse:
+    del current_user
+
+    edges = histogram_edges(settings.score_histogram_scale, settings.score_histogram_buckets, MAX_SCORE)
+    counts, total_players = leaderboard_index.histogram(difficulty, edges)
+    upper_bounds = [edge - 1 for edge in edges[1:]] + [MAX_SCORE]
+    return HistogramResponse(
+        difficulty=difficulty,
+        total_players=total_players,
+        buckets=[
+            HistogramBucket(min_score=low, max_score=high, count=count)
+            for low, high, count in zip(edges, upper_bounds, counts)
+        ],
+    )
@@ -0,0 +1,155 @@
+import threading
+import time
+from functools import lru_cache
+
+from app.core.config import Settings, get_settings
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate_per_minute: float, burst: int, max_keys: int = 100_000) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.burst = float(max(burst, 1))
+        self.max_keys = max_keys
+        self._prune_at = max_keys
+        self._buckets: dict[int, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: int) -> float:
+        """Take one token for ``key``. Returns 0 on success, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self._prune_at:
+                    self._prune(now)
+                self._buckets[key] = [self.burst - 1.0, now]
+                return 0.0
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+
+            bucket[0] = tokens
+            return (1.0 - tokens) / self.rate
+
+    def _prune(self, now: float) -> None:
+        # Buckets idle long enough to be full again carry no state worth keeping.
+        refill_seconds = self.burst / self.rate
+        self._buckets = {key: bucket for key, bucket in self._buckets.items() if now - bucket[1] < refill_seconds}
+        self._prune_at = max(self.max_keys, len(self._buckets) * 2)
+
+
+class WindowedAverage:
+    """Mean of the samples observed in the last ``window_seconds``, kept in one-second buckets.
+
+    Old samples expire with time rather than with newer samples, so the mean
+    returns to normal even when nothing is observed (e.g. while writes are shed).
+    """
+
+    def __init__(self, window_seconds: int) -> None:
+        self.window = max(int(window_seconds), 1)
+        self._seconds = [-1] * self.window
+        self._sums = [0.0] * self.window
+        self._counts = [0] * self.window
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        second = int(time.monotonic())
+        slot = second % self.window
+        with self._lock:
+            if self._seconds[slot] != second:
+                self._seconds[slot] = second
+                self._sums[slot] = 0.0
+                self._counts[slot] = 0
+            self._sums[slot] += value
+            self._counts[slot] += 1
+
+    def mean(self, min_samples: int = 1) -> float:
+        """0 unless at least ``min_samples`` samples fall inside the window."""
+        oldest = int(time.monotonic()) - self.window
+        total = 0.0
+        count = 0
+        with self._lock:
+            for second, value, samples in zip(self._seconds, self._sums, self._counts):
+                if second > oldest:
+                    total += value
+                    count += samples
+        return total / count if count and count >= min_samples else 0.0
+
+
+class LoadMonitor:
+    def __init__(self, window_seconds: int, min_samples: int) -> None:
+        self.min_samples = min_samples
+        self._latency = WindowedAverage(window_seconds)
+        self._connection_wait = WindowedAverage(window_seconds)
+
+    @property
+    def latency(self) -> float:
+        return self._latency.mean(self.min_samples)
+
+    @property
+    def connection_wait(self) -> float:
+        return self._connection_wait.mean(self.min_samples)
+
+    def observe_latency(self, seconds: float) -> None:
+        self._latency.observe(seconds)
+
+    def observe_connection_wait(self, seconds: float) -> None:
+        self._connection_wait.observe(seconds)
+
+    def overloaded(self, settings: Settings) -> bool:
+        if settings.load_shed_latency_ms > 0 and self.latency * 1000 > settings.load_shed_latency_ms:
+            return True
+        if settings.load_shed_connection_wait_ms > 0 and self.connection_wait * 1000 > settings.load_shed_connection_wait_ms:
+            return True
+        return False
+
+
+# A handful of slow requests is not overload: shedding needs min_samples within the window.
+load_monitor = LoadMonitor(get_settings().load_shed_window_seconds, get_settings().load_shed_min_samples)
+
+
+@lru_cache
+def get_rate_limiter(route: str) -> TokenBucketLimiter | None:
+    settings = get_settings()
+    if not settings.rate_limit_enabled:
+        return None
+
+    rate_per_minute = getattr(settings, f"rate_limit_{route}_per_minute")
+    if rate_per_minute <= 0:
+        return None
+    return TokenBucketLimiter(rate_per_minute, getattr(settings, f"rate_limit_{route}_burst"))
+
+
+# Deliberately long-held (the profiler keeps a request open for its whole run) or
+# operator-only routes: their latency says nothing about player-facing load.
+UNMONITORED_PATH_PREFIXES = ("/api/debug/", "/api/admin/")
+
+
+class LatencyMiddleware:
+    """Feeds request latency into ``load_monitor``; shed and throttled responses are not counted."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(UNMONITORED_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code not in (429, 503):
+                load_monitor.observe_latency(time.perf_counter() - started)
@@ -0,0 +1,142 @@
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import PurePath
+from types import CodeType, FrameType
+from typing import Iterable
+
+from fastapi.routing import APIRoute
+
+# SQLAlchemy's driver call sites; their ``statement`` local is the SQL being executed.
+SQL_FRAMES = {"do_execute", "do_executemany", "do_execute_no_params"}
+# Leaf frames of threads parked waiting for work rather than doing any.
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+MAX_SQL_LABEL = 120
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def _short_path(filename: str) -> str:
+    parts = PurePath(filename).parts
+    if "site-packages" in parts:
+        return "/".join(parts[len(parts) - parts[::-1].index("site-packages") :])
+    if "app" in parts:
+        return "/".join(parts[len(parts) - 1 - parts[::-1].index("app") :])
+    return parts[-1] if parts else filename
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of all threads with ``sys._current_frames()``.
+
+    Nothing is hooked into request handling: routes and SQL are recognised from the
+    sampled frames, so the profiler costs nothing while no profile is running.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._labels: dict[CodeType, str] = {}
+        self._route_labels: dict[CodeType, str] = {}
+
+    def register_routes(self, routes: Iterable) -> None:
+        for route in routes:
+            if isinstance(route, APIRoute):
+                code = getattr(route.endpoint, "__code__", None)
+                if code is not None:
+                    self._route_labels[code] = f"route {'|'.join(sorted(route.methods))} {route.path}"
+
+    def run(self, seconds: float, interval: float, include_idle: bool = False) -> tuple[Counter, int]:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+        try:
+            return self._sample(seconds, interval, include_idle)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float, include_idle: bool) -> tuple[Counter, int]:
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        ticks = 0
+        deadline = time.monotonic() + seconds
+        next_tick = time.monotonic()
+        while next_tick < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = self._stack(frame, include_idle)
+                if stack:
+                    stacks[(f"thread {names.get(ident, ident)}", *stack)] += 1
+            ticks += 1
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+        return stacks, ticks
+
+    def _stack(self, frame: FrameType | None, include_idle: bool) -> list[str]:
+        if frame is not None and not include_idle:
+            if (PurePath(frame.f_code.co_filename).name, frame.f_code.co_name) in IDLE_FRAMES:
+                return []
+        # Walked leaf to root, returned root to leaf.
+        stack: list[str] = []
+        while frame is not None:
+            code = frame.f_code
+            if code.co_name in SQL_FRAMES and "sqlalchemy" in code.co_filename:
+                statement = frame.f_locals.get("statement")
+                if isinstance(statement, str):
+                    # ";" separates frames in collapsed stacks.
+                    stack.append("sql " + " ".join(statement.split())[:MAX_SQL_LABEL].replace(";", ","))
+            stack.append(self._label(code))
+            route = self._route_labels.get(code)
+            if route is not None:
+                stack.append(route)
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+
+def to_collapsed(stacks: Counter) -> str:
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common())
+
+
+def to_speedscope(stacks: Counter, interval: float, name: str) -> dict:
+    frames: dict[str, int] = {}
+    samples = []
+    weights = []
+    for stack, count in stacks.most_common():
+        samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+        weights.append(count * interval * 1000)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "space-shooter-backend",
+        "shared": {"frames": [{"name": frame} for frame in frames]},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+profiler = SamplingProfiler()
@@ -1,5 +1,11 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
 from datetime import UTC, datetime, timedelta
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple
 
 from jose import JWTError, jwt
 
@@ -12,20 +18,90 @@ class TokenError(Exception):
     pass
 
 
-def create_session_token(user_id: int, telegram_id: int) -> str:
+class TokenCodec(NamedTuple):
+    encode: Callable[[Dict[str, Any], str], str]
+    decode: Callable[[str, str], Dict[str, Any]]
+
+
+def _jose_encode(payload: Dict[str, Any], secret: str) -> str:
+    return jwt.encode(payload, secret, algorithm=ALGORITHM)
+
+
+def _jose_decode(token: str, secret: str) -> Dict[str, Any]:
+    try:
+        return jwt.decode(token, secret, algorithms=[ALGORITHM])
+    except JWTError as exc:
+        raise TokenError("Invalid session token") from exc
+
+
+# The fast codec emits the same HS256 JWTs as python-jose (identical header bytes),
+# so switching codecs does not invalidate sessions that are already issued.
+_FAST_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+def _b64decode(segment: bytes) -> bytes:
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+@lru_cache(maxsize=4)
+def _signer(secret: str) -> "hmac.HMAC":
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def _fast_encode(payload: Dict[str, Any], secret: str) -> str:
+    body = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).rstrip(b"=")
+    signing_input = _FAST_HEADER + b"." + body
+    mac = _signer(secret).copy()
+    mac.update(signing_input)
+    signature = base64.urlsafe_b64encode(mac.digest()).rstrip(b"=")
+    return (signing_input + b"." + signature).decode("ascii")
+
+
+def _fast_decode(token: str, secret: str) -> Dict[str, Any]:
+    try:
+        raw = token.encode("ascii")
+        header, body, signature = raw.split(b".")
+        if header != _FAST_HEADER and json.loads(_b64decode(header)).get("alg") != ALGORITHM:
+            raise TokenError("Invalid session token")
+
+        mac = _signer(secret).copy()
+        mac.update(raw[: len(header) + 1 + len(body)])
+        if not hmac.compare_digest(mac.digest(), _b64decode(signature)):
+            raise TokenError("Invalid session token")
+
+        payload = json.loads(_b64decode(body))
+    except (UnicodeError, ValueError, AttributeError) as exc:
+        raise TokenError("Invalid session token") from exc
+
+    if not isinstance(payload, dict):
+        raise TokenError("Invalid session token")
+
+    exp = payload.get("exp")
+    if exp is not None and (not isinstance(exp, (int, float)) or exp < time.time()):
+        raise TokenError("Invalid session token")
+
+    return payload
+
+
+TOKEN_CODECS: Dict[str, TokenCodec] = {
+    "jose": TokenCodec(encode=_jose_encode, decode=_jose_decode),
+    "fast": TokenCodec(encode=_fast_encode, decode=_fast_decode),
+}
+
+
+def create_session_token(user_id: int, telegram_id: int, auth_time: int | None = None) -> str:
     settings = get_settings()
-    expire = datetime.now(UTC) + timedelta(hours=settings.jwt_expire_hours)
+    now = datetime.now(UTC)
+    expire = now + timedelta(hours=settings.jwt_expire_hours)
     payload: Dict[str, Any] = {
         "sub": str(user_id),
         "telegram_id": telegram_id,
-        "exp": expire,
+        "exp": int(expire.timestamp()),
+        "auth_time": auth_time if auth_time is not None else int(now.timestamp()),
     }
-    return jwt.encode(payload, settings.jwt_secret, algorithm=ALGORITHM)
+    return TOKEN_CODECS[settings.session_token_codec].encode(payload, settings.jwt_secret)
 
 
 def decode_session_token(token: str) -> Dict[str, Any]:
     settings = get_settings()
-    try:
-        return jwt.decode(token, settings.jwt_secret, algorithms=[ALGORITHM])
-    except JWTError as exc:
-        raise TokenError("Invalid session token") from exc
+    return TOKEN_CODECS[settings.session_token_codec].decode(token, settings.jwt_secret)
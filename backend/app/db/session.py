@@ -1,16 +1,133 @@
-from sqlalchemy import create_engine
+import io
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.core.admission import load_monitor
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+
+def build_engine(url: str, prepare_threshold: int | None = settings.database_prepare_threshold):
+    connect_args = {}
+    if make_url(url).get_driver_name() == "psycopg":
+        # psycopg 3 prepares a statement server-side once a connection has run it this many times.
+        connect_args["prepare_threshold"] = prepare_threshold
+    return create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+
+
+engine = build_engine(settings.database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+read_engine = build_engine(settings.database_read_url) if settings.database_read_url else None
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
+
+
+class ReplicaRouter:
+    def __init__(self, sticky_seconds: float, retry_seconds: float) -> None:
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._unhealthy_until = 0.0
+        self._recent_writes: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def mark_write(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._recent_writes) >= 10_000:
+                self._recent_writes = {key: until for key, until in self._recent_writes.items() if until > now}
+            self._recent_writes[user_id] = now + self.sticky_seconds
+
+    def mark_unhealthy(self) -> None:
+        self._unhealthy_until = time.monotonic() + self.retry_seconds
+
+    def use_primary(self, user_id: int | None) -> bool:
+        now = time.monotonic()
+        if ReadSessionLocal is None or now < self._unhealthy_until:
+            return True
+        return user_id is not None and self._recent_writes.get(user_id, 0.0) > now
+
+
+replica_router = ReplicaRouter(settings.read_your_writes_seconds, settings.read_replica_retry_seconds)
+
+
+def mark_recent_write(*user_ids: int) -> None:
+    if ReadSessionLocal is None:
+        return
+    for user_id in user_ids:
+        replica_router.mark_write(user_id)
+
+
+@contextmanager
+def pipeline(db: Session) -> Iterator[None]:
+    """Send the statements inside without waiting for each reply (psycopg 3 only, else a no-op).
+
+    Only for statements whose results are not read: SQLAlchemy sees no rows and no
+    rowcount for statements sent in pipeline mode. Commit after the block, not inside:
+    a commit hands the connection back to the pool, which may close it mid-pipeline.
+    """
+    connection = db.connection().connection.driver_connection
+    if not hasattr(connection, "pipeline"):
+        yield
+        return
+    with connection.pipeline():
+        yield
+
+
+# COPY through a raw DBAPI cursor of either driver.
+def copy_from(cursor, sql: str, data: str) -> None:
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, io.StringIO(data))
+        return
+    with cursor.copy(sql) as copy:
+        copy.write(data)
+
+
+def copy_to(cursor, sql: str, target) -> None:
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, target)
+        return
+    with cursor.copy(sql) as copy:
+        for chunk in copy:
+            target.write(chunk)
+
 
 def get_db() -> Session:
     db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        db.connection()
+        load_monitor.observe_connection_wait(time.perf_counter() - started)
+        yield db
+    finally:
+        db.close()
+
+
+def open_read_session(user_id: int | None) -> Session:
+    if replica_router.use_primary(user_id):
+        yield from get_db()
+        return
+
+    db = ReadSessionLocal()
+    try:
+        db.connection()
+    except OperationalError as exc:
+        db.close()
+        replica_router.mark_unhealthy()
+        logger.warning("Read replica unavailable, falling back to primary: %s", exc)
+        yield from get_db()
+        return
+
     try:
         yield db
     finally:
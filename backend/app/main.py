@@ -1,12 +1,52 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routers import access, admin, auth, game
+from app.api.routers import access, admin, auth, bootstrap, debug, game
+from app.core.admission import LatencyMiddleware
 from app.core.config import get_settings
+from app.core.profiler import profiler
+from app.db.session import SessionLocal
+from app.services.cache_bus import CacheBusListener
+from app.services.live_leaderboard import live_leaderboards
+from app.services.rank_index import leaderboard_index
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+
+def _warm_rank_index() -> None:
+    with SessionLocal() as db:
+        leaderboard_index.warm(db)
+    live_leaderboards.notify_all()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    del app
+    listener_task = None
+    if settings.cache_bus_enabled:
+        listener = CacheBusListener(on_reconnect=_warm_rank_index if settings.rank_index_enabled else None)
+        listener_task = asyncio.create_task(listener.run())
+        # Listen before warming so no write between the warm-up snapshot and LISTEN is missed.
+        try:
+            await asyncio.wait_for(listener.connected.wait(), 10)
+        except TimeoutError:
+            logger.warning("Cache bus is not connected yet; continuing startup")
+    if settings.rank_index_enabled:
+        await asyncio.to_thread(_warm_rank_index)
+    yield
+    if listener_task is not None:
+        listener_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener_task
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,10 +56,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(LatencyMiddleware)
+
 app.include_router(auth.router, prefix="/api")
+app.include_router(bootstrap.router, prefix="/api")
 app.include_router(access.router, prefix="/api")
 app.include_router(game.router, prefix="/api")
 app.include_router(admin.router, prefix="/api")
+app.include_router(debug.router, prefix="/api")
+profiler.register_routes(app.routes)
 
 
 @app.get("/health")
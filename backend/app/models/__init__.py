@@ -1,5 +1,7 @@
+from app.models.game_telemetry import GameTelemetry
 from app.models.join_request import JoinRequest
 from app.models.score import Score
+from app.models.stats_counter import StatsCounter
 from app.models.user import User
 
-__all__ = ["User", "JoinRequest", "Score"]
+__all__ = ["User", "JoinRequest", "Score", "StatsCounter", "GameTelemetry"]
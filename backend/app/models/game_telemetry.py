@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Integer, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.enums import Difficulty
+
+
+class GameTelemetry(Base):
+    __tablename__ = "game_telemetry"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    game_id: Mapped[uuid.UUID] = mapped_column(Uuid, nullable=False)
+    difficulty: Mapped[Difficulty] = mapped_column(
+        Enum(Difficulty, name="difficulty", values_callable=lambda enum_cls: [item.value for item in enum_cls]),
+        nullable=False,
+    )
+    died: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    death_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    shots: Mapped[int] = mapped_column(Integer, nullable=False)
+    hits: Mapped[int] = mapped_column(Integer, nullable=False)
+    asteroids_spawned: Mapped[int] = mapped_column(Integer, nullable=False)
+    score: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
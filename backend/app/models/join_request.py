@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, String, func
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -9,6 +9,10 @@ from app.models.enums import JoinRequestStatus
 
 class JoinRequest(Base):
     __tablename__ = "join_requests"
+    __table_args__ = (
+        Index("ix_join_requests_pending_queue", "created_at", "id", postgresql_where=text("status = 'PENDING'")),
+        Index("uq_join_requests_user_pending", "user_id", unique=True, postgresql_where=text("status = 'PENDING'")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -20,5 +24,7 @@ class JoinRequest(Base):
     decided_by_admin_tg_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     decided_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    claimed_by_admin_tg_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     user = relationship("User", back_populates="join_requests")
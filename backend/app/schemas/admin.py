@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, Field
 
-from app.models.enums import JoinRequestStatus, UserStatus
+from app.models.enums import Difficulty, JoinRequestStatus, UserStatus
 
 
 class AdminDecisionRequest(BaseModel):
@@ -19,6 +19,8 @@ class AdminRequestItem(BaseModel):
     username: str | None
     first_name: str
     last_name: str | None
+    claimed_by_admin_tg_id: int | None = None
+    claimed_until: datetime | None = None
 
 
 class AdminUserItem(BaseModel):
@@ -29,3 +31,20 @@ class AdminUserItem(BaseModel):
     last_name: str | None
     status: UserStatus
     created_at: datetime
+
+
+class AdminSearchItem(AdminUserItem):
+    request_id: int | None
+    request_status: JoinRequestStatus | None
+
+
+class OverviewDay(BaseModel):
+    day: date
+    games: dict[Difficulty, int]
+    active_players: dict[Difficulty, int]
+
+
+class AdminOverviewResponse(BaseModel):
+    pending_requests: int
+    users_by_status: dict[UserStatus, int]
+    days: list[OverviewDay]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+from app.models.enums import Difficulty, UserStatus
+from app.schemas.access import AccessStatusResponse
+from app.schemas.auth import TelegramAuthRequest
+from app.schemas.common import UserOut
+from app.schemas.game import LeaderboardEntry
+
+
+class BootstrapRequest(TelegramAuthRequest):
+    pass
+
+
+class BootstrapResponse(BaseModel):
+    user: UserOut
+    status: UserStatus
+    is_admin: bool
+    access: AccessStatusResponse
+    leaderboards: dict[Difficulty, list[LeaderboardEntry]]
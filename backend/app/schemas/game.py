@@ -1,13 +1,26 @@
 from datetime import datetime
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 from app.models.enums import Difficulty
 
+MAX_SCORE = 1_000_000
+
 
 class ScoreCreate(BaseModel):
     difficulty: Difficulty
-    score: int = Field(ge=0, le=1000000)
+    score: int = Field(ge=0, le=MAX_SCORE)
+    game_id: UUID | None = None
+
+
+class TelemetryResponse(BaseModel):
+    accepted: int
+
+
+class ScoreSubmitResponse(BaseModel):
+    ok: bool = True
+    duplicate: bool = False
 
 
 class LeaderboardEntry(BaseModel):
@@ -17,3 +30,39 @@ class LeaderboardEntry(BaseModel):
     first_name: str
     score: int
     achieved_at: datetime
+
+
+class PlayerRankResponse(BaseModel):
+    difficulty: Difficulty
+    rank: int | None
+    score: int | None
+    total_players: int
+
+
+class RankedEntry(BaseModel):
+    rank: int
+    user_id: int
+    telegram_id: int
+    username: str | None
+    first_name: str
+    score: int
+
+
+class PercentileResponse(BaseModel):
+    difficulty: Difficulty
+    score: int
+    players_below: int
+    total_players: int
+    percentile: float
+
+
+class HistogramBucket(BaseModel):
+    min_score: int
+    max_score: int
+    count: int
+
+
+class HistogramResponse(BaseModel):
+    difficulty: Difficulty
+    total_players: int
+    buckets: list[HistogramBucket]
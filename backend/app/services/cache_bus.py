@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Callable, NamedTuple
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.db.session import engine, mark_recent_write
+from app.models.enums import Difficulty, UserStatus
+from app.services.live_leaderboard import live_leaderboards
+from app.services.rank_index import leaderboard_index
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Identifies this process so the listener skips events it already applied locally.
+ORIGIN = uuid.uuid4().hex
+KEEPALIVE_SECONDS = 30
+MAX_BACKOFF_SECONDS = 30
+
+# The listener relies on psycopg2's poll()/notifies whichever driver the app engine uses.
+listen_engine = create_engine(engine.url.set(drivername="postgresql+psycopg2"), poolclass=NullPool)
+
+
+class UserStatusChanged(NamedTuple):
+    user_id: int
+    status: UserStatus
+
+
+class UserProfileChanged(NamedTuple):
+    user_id: int
+
+
+class LeaderboardChanged(NamedTuple):
+    difficulty: Difficulty
+    user_id: int
+    score: int
+
+
+Event = UserStatusChanged | UserProfileChanged | LeaderboardChanged
+
+EVENT_TYPES: dict[str, Callable[[dict], Event]] = {
+    "user_status": lambda data: UserStatusChanged(int(data["user_id"]), UserStatus(data["status"])),
+    "user_profile": lambda data: UserProfileChanged(int(data["user_id"])),
+    "leaderboard": lambda data: LeaderboardChanged(Difficulty(data["difficulty"]), int(data["user_id"]), int(data["score"])),
+}
+EVENT_NAMES = {UserStatusChanged: "user_status", UserProfileChanged: "user_profile", LeaderboardChanged: "leaderboard"}
+
+
+def encode(event: Event) -> str:
+    fields = {key: getattr(value, "value", value) for key, value in event._asdict().items()}
+    return json.dumps({"origin": ORIGIN, "type": EVENT_NAMES[type(event)], **fields}, separators=(",", ":"))
+
+
+def decode(payload: str) -> tuple[str, Event]:
+    data = json.loads(payload)
+    return data["origin"], EVENT_TYPES[data["type"]](data)
+
+
+def publish(db: Session, *events: Event) -> None:
+    # NOTIFY is transactional: listeners only see the events once the caller commits.
+    for event in events:
+        db.execute(select(func.pg_notify(settings.cache_bus_channel, encode(event))))
+
+
+def apply(event: Event) -> None:
+    if isinstance(event, LeaderboardChanged):
+        mark_recent_write(event.user_id)
+        if leaderboard_index.submit(event.difficulty, event.user_id, event.score):
+            live_leaderboards.notify(event.difficulty, event.score)
+    elif isinstance(event, UserStatusChanged):
+        mark_recent_write(event.user_id)
+        if event.status != UserStatus.APPROVED:
+            leaderboard_index.remove_user(event.user_id)
+            live_leaderboards.notify_all()
+    elif isinstance(event, UserProfileChanged):
+        mark_recent_write(event.user_id)
+        live_leaderboards.notify_user(event.user_id)
+
+
+def _connect():
+    cargs, cparams = listen_engine.dialect.create_connect_args(listen_engine.url)
+    connection = listen_engine.dialect.connect(*cargs, **cparams)
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f'LISTEN "{settings.cache_bus_channel}"')
+    return connection
+
+
+def _keepalive(connection) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+class CacheBusListener:
+    def __init__(
+        self,
+        on_reconnect: Callable[[], None] | None = None,
+        on_event: Callable[[str, Event], None] | None = None,
+    ) -> None:
+        self.on_reconnect = on_reconnect
+        self.on_event = on_event
+        self.connected = asyncio.Event()
+        self.received = 0
+
+    async def run(self) -> None:
+        backoff = 1
+        first = True
+        while True:
+            try:
+                connection = await asyncio.to_thread(_connect)
+            except Exception as exc:
+                logger.warning("Cache bus connect failed, retrying in %ss: %s", backoff, exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+                continue
+
+            backoff = 1
+            try:
+                self.connected.set()
+                if not first and self.on_reconnect is not None:
+                    # Events published while disconnected are lost, so rebuild instead of patching.
+                    await asyncio.to_thread(self.on_reconnect)
+                first = False
+                await self._consume(connection)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Cache bus connection lost: %s", exc)
+            finally:
+                self.connected.clear()
+                connection.close()
+
+    async def _consume(self, connection) -> None:
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        fd = connection.fileno()
+        loop.add_reader(fd, readable.set)
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(readable.wait(), KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    # A silently dropped socket never becomes readable; a round trip surfaces it.
+                    await asyncio.to_thread(_keepalive, connection)
+                readable.clear()
+                connection.poll()
+                while connection.notifies:
+                    self._handle(connection.notifies.pop(0).payload)
+        finally:
+            loop.remove_reader(fd)
+
+    def _handle(self, payload: str) -> None:
+        try:
+            origin, event = decode(payload)
+        except (KeyError, ValueError) as exc:
+            logger.warning("Ignoring malformed cache bus event %r: %s", payload, exc)
+            return
+        self.received += 1
+        if self.on_event is not None:
+            self.on_event(origin, event)
+        if origin != ORIGIN:
+            apply(event)
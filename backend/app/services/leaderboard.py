@@ -0,0 +1,86 @@
+from typing import Iterable
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.models.enums import Difficulty, UserStatus
+from app.models.score import Score
+from app.models.user import User
+from app.schemas.game import LeaderboardEntry
+
+
+def fetch_leaderboards(
+    db: Session, difficulties: Iterable[Difficulty], limit: int = 10
+) -> dict[Difficulty, list[LeaderboardEntry]]:
+    difficulties = list(difficulties)
+
+    best_scores = (
+        select(
+            Score.difficulty,
+            Score.user_id,
+            func.max(Score.score).label("best_score"),
+        )
+        .join(User, User.id == Score.user_id)
+        .where(and_(Score.difficulty.in_(difficulties), User.status == UserStatus.APPROVED))
+        .group_by(Score.difficulty, Score.user_id)
+        .subquery()
+    )
+
+    achieved = (
+        select(
+            best_scores.c.difficulty,
+            best_scores.c.user_id,
+            best_scores.c.best_score,
+            func.min(Score.created_at).label("achieved_at"),
+        )
+        .join(
+            Score,
+            and_(
+                Score.user_id == best_scores.c.user_id,
+                Score.difficulty == best_scores.c.difficulty,
+                Score.score == best_scores.c.best_score,
+            ),
+        )
+        .group_by(best_scores.c.difficulty, best_scores.c.user_id, best_scores.c.best_score)
+        .subquery()
+    )
+
+    ranked = select(
+        achieved,
+        func.row_number()
+        .over(
+            partition_by=achieved.c.difficulty,
+            # Same order as the rank index (and the live board): earliest achiever first among ties.
+            order_by=(achieved.c.best_score.desc(), achieved.c.achieved_at, achieved.c.user_id),
+        )
+        .label("position"),
+    ).subquery()
+
+    query = (
+        select(
+            ranked.c.difficulty,
+            User.id,
+            User.telegram_id,
+            User.username,
+            User.first_name,
+            ranked.c.best_score,
+            ranked.c.achieved_at,
+        )
+        .join(User, User.id == ranked.c.user_id)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.difficulty, ranked.c.position)
+    )
+
+    leaderboards: dict[Difficulty, list[LeaderboardEntry]] = {difficulty: [] for difficulty in difficulties}
+    for row in db.execute(query):
+        leaderboards[row.difficulty].append(
+            LeaderboardEntry(
+                user_id=row.id,
+                telegram_id=row.telegram_id,
+                username=row.username,
+                first_name=row.first_name,
+                score=int(row.best_score),
+                achieved_at=row.achieved_at,
+            )
+        )
+    return leaderboards
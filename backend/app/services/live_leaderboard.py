@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.enums import Difficulty
+from app.models.user import User
+from app.services.rank_index import leaderboard_index
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class Subscriber:
+    """Outbox of one connection: at most ``max_queued`` encoded messages, shared with other subscribers."""
+
+    def __init__(self, max_queued: int) -> None:
+        self.max_queued = max_queued
+        self.messages: deque[str] = deque()
+        self.dropped = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, message: str) -> bool:
+        if len(self.messages) >= self.max_queued:
+            self.dropped = True
+            self._wakeup.set()
+            return False
+        self.messages.append(message)
+        self._wakeup.set()
+        return True
+
+    async def next(self) -> str | None:
+        # None once the subscriber has been dropped for falling behind.
+        while not self.dropped:
+            if self.messages:
+                return self.messages.popleft()
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        return None
+
+
+class Board:
+    def __init__(self, difficulty: Difficulty) -> None:
+        self.difficulty = difficulty
+        self.subscribers: set[Subscriber] = set()
+        # None while nobody listens; rebuilt for the next subscriber.
+        self.entries: list[dict[str, Any]] | None = None
+        self.snapshot = ""
+        self.version = 0
+        # Lowest score on a full board: lower submits cannot change it. Read from request threads.
+        self.threshold = -1
+        self.flush_scheduled = False
+        self.lock = asyncio.Lock()
+
+
+def _encode(message: dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+
+def _load_users(user_ids: list[int]) -> dict[int, dict[str, Any]]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(User.id, User.telegram_id, User.username, User.first_name).where(User.id.in_(user_ids))
+        )
+        return {
+            row.id: {"telegram_id": row.telegram_id, "username": row.username, "first_name": row.first_name}
+            for row in rows
+        }
+
+
+class LiveLeaderboards:
+    """Pushes the top of each difficulty's board to WebSocket subscribers.
+
+    Changes reported by ``notify`` are coalesced for ``live_leaderboard_coalesce_ms``,
+    then the top is re-read from the rank index (names from the database) and only the
+    entries whose position, rank, score or name changed are broadcast. Each message is encoded once and
+    queued by reference; a subscriber whose queue is full is dropped.
+    """
+
+    def __init__(self) -> None:
+        self._boards = {difficulty: Board(difficulty) for difficulty in Difficulty}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.dropped = 0
+
+    @property
+    def connections(self) -> int:
+        return sum(len(board.subscribers) for board in self._boards.values())
+
+    def notify(self, difficulty: Difficulty, score: int | None = None) -> None:
+        # Called from request threads and the cache bus listener.
+        loop = self._loop
+        board = self._boards[difficulty]
+        if loop is None or not board.subscribers or (score is not None and score < board.threshold):
+            return
+        loop.call_soon_threadsafe(self._schedule, board)
+
+    def notify_all(self) -> None:
+        for difficulty in Difficulty:
+            self.notify(difficulty)
+
+    def notify_user(self, user_id: int) -> None:
+        # Profile changes only matter to boards currently showing the user.
+        for difficulty, board in self._boards.items():
+            entries = board.entries
+            if entries and any(entry["user_id"] == user_id for entry in entries):
+                self.notify(difficulty)
+
+    async def subscribe(self, difficulty: Difficulty) -> Subscriber:
+        self._loop = asyncio.get_running_loop()
+        board = self._boards[difficulty]
+        subscriber = Subscriber(settings.live_leaderboard_max_queued)
+        async with board.lock:
+            # Registered before the index is read, so no change made meanwhile is missed.
+            board.subscribers.add(subscriber)
+            if board.entries is None:
+                try:
+                    board.entries = await self._read_top(board)
+                except BaseException:
+                    board.subscribers.discard(subscriber)
+                    raise
+                board.version += 1
+                board.snapshot = self._snapshot(board)
+            subscriber.push(board.snapshot)
+        return subscriber
+
+    def unsubscribe(self, difficulty: Difficulty, subscriber: Subscriber) -> None:
+        self._boards[difficulty].subscribers.discard(subscriber)
+
+    def _schedule(self, board: Board) -> None:
+        if board.flush_scheduled:
+            return
+        board.flush_scheduled = True
+        self._loop.call_later(settings.live_leaderboard_coalesce_ms / 1000, self._start_flush, board)
+
+    def _start_flush(self, board: Board) -> None:
+        task = self._loop.create_task(self._flush(board))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, board: Board) -> None:
+        async with board.lock:
+            board.flush_scheduled = False
+            if not board.subscribers:
+                board.entries = None
+                board.threshold = -1
+                return
+            previous = board.entries or []
+            try:
+                entries = await self._read_top(board)
+            except Exception:
+                logger.exception("Failed to refresh live %s leaderboard", board.difficulty.value)
+                return
+
+            before = {entry["user_id"]: entry for entry in previous}
+            changed = [entry for entry in entries if before.get(entry["user_id"]) != entry]
+            removed = sorted(before.keys() - {entry["user_id"] for entry in entries})
+            if not changed and not removed:
+                return
+
+            board.entries = entries
+            board.version += 1
+            board.snapshot = self._snapshot(board)
+            delta = _encode(
+                {
+                    "type": "delta",
+                    "difficulty": board.difficulty.value,
+                    "version": board.version,
+                    "size": len(entries),
+                    "entries": changed,
+                    "removed": removed,
+                }
+            )
+            dropped = [subscriber for subscriber in board.subscribers if not subscriber.push(delta)]
+            if dropped:
+                board.subscribers.difference_update(dropped)
+                self.dropped += len(dropped)
+                logger.warning("Dropped %s slow live %s leaderboard subscribers", len(dropped), board.difficulty.value)
+
+    async def _read_top(self, board: Board) -> list[dict[str, Any]]:
+        # Submits racing with the read must not be filtered by the old threshold.
+        board.threshold = -1
+        size = settings.live_leaderboard_size
+        ranked = leaderboard_index.range(board.difficulty, 0, size)
+        # Names are re-read on every refresh (one lookup of at most `size` ids), so renames reach subscribers.
+        users = await asyncio.to_thread(_load_users, [user_id for _, user_id, _ in ranked]) if ranked else {}
+
+        entries = []
+        for rank, user_id, score in ranked:
+            user = users.get(user_id)
+            if user is None:
+                continue
+            entries.append(
+                {
+                    "position": len(entries) + 1,
+                    "rank": rank,
+                    "user_id": user_id,
+                    "telegram_id": user["telegram_id"],
+                    "username": user["username"],
+                    "first_name": user["first_name"],
+                    "score": score,
+                }
+            )
+        board.threshold = ranked[-1][2] if len(ranked) >= size else -1
+        return entries
+
+    def _snapshot(self, board: Board) -> str:
+        return _encode(
+            {
+                "type": "snapshot",
+                "difficulty": board.difficulty.value,
+                "version": board.version,
+                "entries": board.entries,
+            }
+        )
+
+
+live_leaderboards = LiveLeaderboards()
@@ -2,24 +2,24 @@ import logging
 
 import httpx
 
+from sqlalchemy import Row
+
 from app.core.config import Settings
-from app.models.join_request import JoinRequest
-from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
 
-def notify_admins_about_request(settings: Settings, user: User, join_request: JoinRequest) -> None:
+def notify_admins_about_request(settings: Settings, request: Row) -> None:
     if not settings.bot_internal_token:
         return
 
     payload = {
-        "request_id": join_request.id,
-        "telegram_id": user.telegram_id,
-        "username": user.username,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "comment": join_request.comment,
+        "request_id": request.request_id,
+        "telegram_id": request.telegram_id,
+        "username": request.username,
+        "first_name": request.first_name,
+        "last_name": request.last_name,
+        "comment": request.comment,
     }
 
     try:
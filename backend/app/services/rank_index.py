@@ -0,0 +1,278 @@
+import logging
+import threading
+from array import array
+from typing import Iterable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.enums import Difficulty, UserStatus
+from app.models.score import Score
+from app.models.user import User
+from app.schemas.game import MAX_SCORE
+
+logger = logging.getLogger(__name__)
+
+EMPTY = -1
+
+
+class RankIndex:
+    """Order-statistic index of best scores for one difficulty.
+
+    A Fenwick tree over the score domain holds player counts per score, so rank
+    lookups are O(log max_score). Ranks are competition ranks: tied players share
+    a rank. Players sharing a score are kept in intrusive doubly linked lists
+    (earliest achiever first) stored in flat int32 arrays indexed by score and by
+    user id, so there are no per-player Python objects.
+    """
+
+    def __init__(self, max_score: int) -> None:
+        self.max_score = max_score
+        self.size = max_score + 1
+        self.total = 0
+        self._tree = array("i", bytes(4 * (self.size + 1)))
+        self._head = array("i", [EMPTY]) * self.size
+        self._tail = array("i", [EMPTY]) * self.size
+        self._best = array("i")
+        self._next = array("i")
+        self._prev = array("i")
+
+    def nbytes(self) -> int:
+        return sum(
+            buf.itemsize * len(buf) for buf in (self._tree, self._head, self._tail, self._best, self._next, self._prev)
+        )
+
+    def _ensure_user(self, user_id: int) -> None:
+        if user_id < len(self._best):
+            return
+        grow = max(user_id + 1, len(self._best) * 2, 1024) - len(self._best)
+        filler = array("i", [EMPTY]) * grow
+        self._best.extend(filler)
+        self._next.extend(filler)
+        self._prev.extend(filler)
+
+    def _add(self, score: int, delta: int) -> None:
+        i = score + 1
+        tree = self._tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, score: int) -> int:
+        i = score + 1
+        tree = self._tree
+        result = 0
+        while i > 0:
+            result += tree[i]
+            i -= i & -i
+        return result
+
+    def _lower_bound(self, position: int) -> int:
+        # Smallest score whose ascending prefix count reaches ``position``.
+        tree = self._tree
+        index = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            candidate = index + step
+            if candidate <= self.size and tree[candidate] < position:
+                index = candidate
+                position -= tree[candidate]
+            step >>= 1
+        return index
+
+    def _link(self, user_id: int, score: int) -> None:
+        tail = self._tail[score]
+        self._prev[user_id] = tail
+        self._next[user_id] = EMPTY
+        if tail == EMPTY:
+            self._head[score] = user_id
+        else:
+            self._next[tail] = user_id
+        self._tail[score] = user_id
+
+    def _unlink(self, user_id: int, score: int) -> None:
+        prev_id = self._prev[user_id]
+        next_id = self._next[user_id]
+        if prev_id == EMPTY:
+            self._head[score] = next_id
+        else:
+            self._next[prev_id] = next_id
+        if next_id == EMPTY:
+            self._tail[score] = prev_id
+        else:
+            self._prev[next_id] = prev_id
+
+    def load(self, rows: Iterable[tuple[int, int]]) -> None:
+        """Bulk-load ``(user_id, best_score)`` rows, ordered by when the best score was achieved."""
+        counts = self._tree
+        for user_id, score in rows:
+            score = min(max(score, 0), self.max_score)
+            self._ensure_user(user_id)
+            if self._best[user_id] != EMPTY:
+                continue
+            self._best[user_id] = score
+            self._link(user_id, score)
+            counts[score + 1] += 1
+            self.total += 1
+
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                counts[parent] += counts[i]
+
+    def update(self, user_id: int, score: int) -> bool:
+        score = min(max(score, 0), self.max_score)
+        self._ensure_user(user_id)
+        previous = self._best[user_id]
+        if previous >= score:
+            return False
+
+        if previous == EMPTY:
+            self.total += 1
+        else:
+            self._unlink(user_id, previous)
+            self._add(previous, -1)
+
+        self._best[user_id] = score
+        self._link(user_id, score)
+        self._add(score, 1)
+        return True
+
+    def remove(self, user_id: int) -> bool:
+        previous = self.best_score(user_id)
+        if previous is None:
+            return False
+        self._unlink(user_id, previous)
+        self._add(previous, -1)
+        self._best[user_id] = EMPTY
+        self.total -= 1
+        return True
+
+    def best_score(self, user_id: int) -> int | None:
+        if user_id >= len(self._best) or self._best[user_id] == EMPTY:
+            return None
+        return self._best[user_id]
+
+    def rank_of(self, user_id: int) -> int | None:
+        score = self.best_score(user_id)
+        if score is None:
+            return None
+        return self.count_above(score) + 1
+
+    def count_above(self, score: int) -> int:
+        return self.total - self._prefix(min(max(score, -1), self.max_score))
+
+    def count_below(self, score: int) -> int:
+        return self._prefix(min(max(score - 1, -1), self.max_score))
+
+    def histogram(self, edges: list[int]) -> list[int]:
+        """Player counts per bucket ``[edges[i], edges[i + 1])``; the last bucket runs to ``max_score``."""
+        prefixes = [self.count_below(edge) for edge in edges] + [self.total]
+        return [prefixes[i + 1] - prefixes[i] for i in range(len(edges))]
+
+    def iter_range(self, offset: int, limit: int) -> Iterator[tuple[int, int, int]]:
+        """Yield ``(rank, user_id, score)`` for leaderboard positions ``offset + 1 .. offset + limit``.
+
+        Each distinct score costs one O(log max_score) descent; starting inside a tie
+        group additionally walks the group up to ``offset``.
+        """
+        position = offset + 1
+        end = min(offset + limit, self.total)
+        while position <= end:
+            score = self._lower_bound(self.total - position + 1)
+            rank = self.count_above(score) + 1
+            cursor = self._head[score]
+            for _ in range(position - rank):
+                cursor = self._next[cursor]
+            while cursor != EMPTY and position <= end:
+                yield rank, cursor, score
+                cursor = self._next[cursor]
+                position += 1
+
+    def top(self, k: int) -> list[tuple[int, int, int]]:
+        return list(self.iter_range(0, k))
+
+
+class LeaderboardIndex:
+    def __init__(self, max_score: int) -> None:
+        self.max_score = max_score
+        self.ready = False
+        self._lock = threading.Lock()
+        self._indexes: dict[Difficulty, RankIndex] = {}
+        # Submits seen while a warm-up query runs; replayed onto the fresh indexes (updates are idempotent).
+        self._pending: list[tuple[Difficulty, int, int]] | None = None
+
+    def warm(self, db: Session) -> None:
+        with self._lock:
+            self._pending = []
+        indexes = {difficulty: RankIndex(self.max_score) for difficulty in Difficulty}
+        for difficulty, index in indexes.items():
+            best = (
+                select(Score.user_id, Score.score, Score.created_at)
+                .join(User, User.id == Score.user_id)
+                .where(Score.difficulty == difficulty, User.status == UserStatus.APPROVED)
+                .order_by(Score.user_id, Score.score.desc(), Score.created_at)
+                .distinct(Score.user_id)
+                .subquery()
+            )
+            rows = db.execute(
+                select(best.c.user_id, best.c.score).order_by(best.c.created_at, best.c.user_id).execution_options(
+                    yield_per=10_000
+                )
+            )
+            index.load((user_id, score) for user_id, score in rows)
+            logger.info("Rank index for %s warmed with %s players", difficulty.value, index.total)
+
+        with self._lock:
+            for difficulty, user_id, score in self._pending:
+                indexes[difficulty].update(user_id, score)
+            self._pending = None
+            self._indexes = indexes
+            self.ready = True
+
+    def submit(self, difficulty: Difficulty, user_id: int, score: int) -> bool:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((difficulty, user_id, score))
+            if not self.ready:
+                return False
+            return self._indexes[difficulty].update(user_id, score)
+
+    def remove_user(self, user_id: int) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending = [item for item in self._pending if item[1] != user_id]
+            for index in self._indexes.values():
+                index.remove(user_id)
+
+    def rank_of(self, difficulty: Difficulty, user_id: int) -> tuple[int | None, int | None, int]:
+        with self._lock:
+            index = self._indexes[difficulty]
+            return index.rank_of(user_id), index.best_score(user_id), index.total
+
+    def range(self, difficulty: Difficulty, offset: int, limit: int) -> list[tuple[int, int, int]]:
+        with self._lock:
+            return list(self._indexes[difficulty].iter_range(offset, limit))
+
+    def percentile(self, difficulty: Difficulty, score: int) -> tuple[int, int]:
+        with self._lock:
+            index = self._indexes[difficulty]
+            return index.count_below(score), index.total
+
+    def histogram(self, difficulty: Difficulty, edges: list[int]) -> tuple[list[int], int]:
+        with self._lock:
+            index = self._indexes[difficulty]
+            return index.histogram(edges), index.total
+
+
+def histogram_edges(scale: str, buckets: int, max_score: int) -> list[int]:
+    if scale == "log":
+        edges = {0} | {round(max_score ** (i / buckets)) for i in range(1, buckets)}
+    else:
+        edges = {max_score * i // buckets for i in range(buckets)}
+    # Too many buckets for the score range would collapse edges and silently shrink the histogram.
+    assert len(edges) == buckets, f"{buckets} {scale} buckets do not fit scores up to {max_score}"
+    return sorted(edges)
+
+
+leaderboard_index = LeaderboardIndex(MAX_SCORE)
@@ -0,0 +1,124 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Date, case, exists, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.enums import Difficulty, JoinRequestStatus, UserStatus
+from app.models.join_request import JoinRequest
+from app.models.score import Score
+from app.models.stats_counter import StatsCounter
+from app.models.user import User
+
+USERS = "users"
+PENDING_REQUESTS = "pending_requests"
+GAMES = "games"
+ACTIVE_PLAYERS = "active_players"
+
+# Gauges are stored as per-day deltas; their current value is the sum over all days.
+GAUGES = (USERS, PENDING_REQUESTS)
+DAILY = (GAMES, ACTIVE_PLAYERS)
+
+Delta = tuple[str, str, int | ColumnElement]
+
+
+def utc_today() -> ColumnElement:
+    return func.timezone("UTC", func.now()).cast(Date)
+
+
+def bump(db: Session, deltas: Iterable[Delta], day: date | ColumnElement | None = None) -> None:
+    merged: dict[tuple[str, str], int | ColumnElement] = defaultdict(int)
+    for name, key, delta in deltas:
+        merged[name, key] = merged[name, key] + delta
+    # Sorted so concurrent writers lock counter rows in the same order.
+    rows = [
+        {"day": utc_today() if day is None else day, "name": name, "key": key, "value": delta}
+        for (name, key), delta in sorted(merged.items(), key=lambda item: item[0])
+        if not (isinstance(delta, int) and delta == 0)
+    ]
+    if not rows:
+        return
+
+    insert_stmt = pg_insert(StatsCounter).values(rows)
+    db.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=[StatsCounter.day, StatsCounter.name, StatsCounter.key],
+            set_={"value": StatsCounter.value + insert_stmt.excluded.value},
+        )
+    )
+
+
+def record_new_user(db: Session) -> None:
+    bump(db, [(USERS, UserStatus.NEW.value, 1)])
+
+
+def record_status_change(db: Session, previous: UserStatus, current: UserStatus, pending_delta: int) -> None:
+    bump(db, [(USERS, previous.value, -1), (USERS, current.value, 1), (PENDING_REQUESTS, "", pending_delta)])
+
+
+def record_game(db: Session, score_id: int, user_id: int, difficulty: Difficulty) -> None:
+    day_start = func.timezone("UTC", func.date_trunc("day", func.timezone("UTC", func.now())))
+    played_today = exists().where(
+        Score.user_id == user_id,
+        Score.difficulty == difficulty,
+        Score.created_at >= day_start,
+        Score.id != score_id,
+    )
+    bump(db, [(GAMES, difficulty.value, 1), (ACTIVE_PLAYERS, difficulty.value, case((played_today, 0), else_=1))])
+
+
+def reconcile(db: Session, days: int) -> list[tuple[date, str, str, int]]:
+    """Recount from the source tables and write the differences as corrections.
+
+    Run in a REPEATABLE READ transaction: counters and source rows then come from
+    one snapshot, and applying corrections as increments keeps concurrent bumps.
+    """
+    today = db.scalar(select(utc_today()))
+    since = db.scalar(select(utc_today() - days + 1))
+
+    expected: dict[tuple[date, str, str], int] = {}
+    for status in UserStatus:
+        expected[today, USERS, status.value] = 0
+    for status, count in db.execute(select(User.status, func.count()).group_by(User.status)):
+        expected[today, USERS, status.value] = count
+    expected[today, PENDING_REQUESTS, ""] = db.scalar(
+        select(func.count()).select_from(JoinRequest).where(JoinRequest.status == JoinRequestStatus.PENDING)
+    )
+    score_day = func.timezone("UTC", Score.created_at).cast(Date)
+    for day, difficulty, games, players in db.execute(
+        select(score_day, Score.difficulty, func.count(), func.count(Score.user_id.distinct()))
+        .where(score_day >= since)
+        .group_by(score_day, Score.difficulty)
+    ):
+        expected[day, GAMES, difficulty.value] = games
+        expected[day, ACTIVE_PLAYERS, difficulty.value] = players
+
+    counted: dict[tuple[date, str, str], int] = {}
+    for name, key, value in db.execute(
+        select(StatsCounter.name, StatsCounter.key, func.sum(StatsCounter.value))
+        .where(StatsCounter.name.in_(GAUGES))
+        .group_by(StatsCounter.name, StatsCounter.key)
+    ):
+        counted[today, name, key] = int(value)
+    for day, name, key, value in db.execute(
+        select(StatsCounter.day, StatsCounter.name, StatsCounter.key, StatsCounter.value).where(
+            StatsCounter.name.in_(DAILY), StatsCounter.day >= since
+        )
+    ):
+        counted[day, name, key] = value
+
+    corrections = []
+    for bucket in sorted(expected.keys() | counted.keys()):
+        drift = expected.get(bucket, 0) - counted.get(bucket, 0)
+        if drift:
+            corrections.append((*bucket, drift))
+
+    by_day: dict[date, list[Delta]] = defaultdict(list)
+    for day, name, key, drift in corrections:
+        by_day[day].append((name, key, drift))
+    for day, deltas in sorted(by_day.items()):
+        bump(db, deltas, day=day)
+    return corrections
@@ -0,0 +1,82 @@
+import struct
+import zlib
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from app.db.session import copy_from
+from app.models.enums import Difficulty
+
+# Batch layout (little-endian), shared with frontend/src/game/telemetry.ts:
+#   header: magic "ST", version, flags, record count
+#   records: game id (16 raw UUID bytes), difficulty code, record flags, 2 pad bytes,
+#            duration_ms, death_ms, shots, hits, asteroids_spawned, score (int32 each)
+# With BATCH_ZLIB set, everything after the header is one zlib stream.
+HEADER = struct.Struct("<2sBBI")
+RECORD = struct.Struct("<16sBBxxiiiiii")
+MAGIC = b"ST"
+VERSION = 1
+BATCH_ZLIB = 0x01
+RECORD_DIED = 0x01
+
+DIFFICULTY_CODES = (Difficulty.EASY, Difficulty.NORMAL, Difficulty.HARD)
+NULL = "\\N"
+
+COPY_SQL = (
+    "COPY game_telemetry (user_id, game_id, difficulty, died, duration_ms, death_ms, shots, hits, "
+    "asteroids_spawned, score) FROM STDIN"
+)
+
+
+class TelemetryError(ValueError):
+    pass
+
+
+def decode_batch(data: bytes, max_records: int) -> Iterator[tuple]:
+    """Validate a batch and return an iterator of raw ``RECORD`` tuples over its payload."""
+    if len(data) < HEADER.size:
+        raise TelemetryError("Truncated telemetry header")
+    magic, version, flags, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise TelemetryError("Unsupported telemetry format")
+    if count > max_records:
+        raise TelemetryError(f"At most {max_records} records per batch")
+
+    expected = count * RECORD.size
+    payload = memoryview(data)[HEADER.size :]
+    if flags & BATCH_ZLIB:
+        decompressor = zlib.decompressobj()
+        try:
+            # Bounded output: a compression bomb cannot expand past the declared size.
+            inflated = decompressor.decompress(payload, expected + 1)
+        except zlib.error as exc:
+            raise TelemetryError("Corrupt compressed telemetry") from exc
+        if decompressor.unconsumed_tail or not decompressor.eof:
+            raise TelemetryError("Telemetry payload does not match record count")
+        payload = memoryview(inflated)
+    if len(payload) != expected:
+        raise TelemetryError("Telemetry payload does not match record count")
+    return RECORD.iter_unpack(payload)
+
+
+def to_copy_rows(user_id: int, records: Iterator[tuple]) -> tuple[str, int]:
+    lines = []
+    for game_id, difficulty, flags, duration_ms, death_ms, shots, hits, spawned, score in records:
+        if difficulty >= len(DIFFICULTY_CODES):
+            raise TelemetryError("Unknown difficulty code")
+        if min(duration_ms, death_ms, shots, hits, spawned, score) < 0:
+            raise TelemetryError("Negative telemetry value")
+        died = flags & RECORD_DIED
+        lines.append(
+            f"{user_id}\t{game_id.hex()}\t{DIFFICULTY_CODES[difficulty].value}\t{'t' if died else 'f'}\t"
+            f"{duration_ms}\t{death_ms if died else NULL}\t{shots}\t{hits}\t{spawned}\t{score}\n"
+        )
+    return "".join(lines), len(lines)
+
+
+def append_batch(db: Session, user_id: int, records: Iterator[tuple]) -> int:
+    rows, count = to_copy_rows(user_id, records)
+    if count:
+        with db.connection().connection.cursor() as cursor:
+            copy_from(cursor, COPY_SQL, rows)
+    return count
@@ -0,0 +1,198 @@
+"""Time hot request paths against a seeded dataset and compare them to a stored baseline.
+
+Usage (from the backend directory, after scripts.seed_dataset):
+    python -m scripts.bench_data_scale --save-baseline
+    python -m scripts.bench_data_scale
+    python -m scripts.bench_data_scale --only get_leaderboard,list_users --no-explain
+
+Each benchmark calls the route or dependency function in-process with a fresh
+session, so timings cover SQL, ORM loading and response model building but not
+HTTP. Every SELECT a benchmark issues is then re-run under EXPLAIN (ANALYZE,
+BUFFERS). Exits with status 1 when a median is slower than the baseline by more
+than --tolerance. Baselines are machine-specific: save one on the machine that
+runs the comparison, with the same seeded volumes.
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlencode
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.api.routers import admin, game
+from app.core.config import get_settings
+from app.db.session import SessionLocal, engine
+from app.models import JoinRequest, Score, User
+from app.models.enums import Difficulty, JoinRequestStatus, UserStatus
+from app.services.telegram_webapp import verify_telegram_init_data
+
+DEFAULT_BASELINE = Path(__file__).with_name("bench_data_scale_baseline.json")
+
+
+def _signed_init_data(user: User, bot_token: str) -> str:
+    pairs = {
+        "auth_date": str(int(time.time())),
+        "query_id": "bench",
+        "user": json.dumps({"id": user.telegram_id, "first_name": user.first_name, "username": user.username}),
+    }
+    data_check_string = "\n".join(f"{key}={value}" for key, value in sorted(pairs.items()))
+    secret_key = hmac.new(b"WebAppData", bot_token.encode("utf-8"), hashlib.sha256).digest()
+    pairs["hash"] = hmac.new(secret_key, data_check_string.encode("utf-8"), hashlib.sha256).hexdigest()
+    return urlencode(pairs)
+
+
+def build_benchmarks(user: User) -> dict[str, Callable[[Session], object]]:
+    settings = get_settings()
+    payload = {"sub": str(user.id), "telegram_id": user.telegram_id}
+    init_data = _signed_init_data(user, settings.bot_token)
+    return {
+        **{
+            f"get_leaderboard[{difficulty.value}]": lambda db, difficulty=difficulty: game.get_leaderboard(
+                difficulty=difficulty, db=db, current_user=user
+            )
+            for difficulty in Difficulty
+        },
+        "list_users": lambda db: admin.list_users(db=db, admin_user=user),
+        # The admin panel's query: pending requests only, first page.
+        "list_requests": lambda db: admin.list_requests(
+            request_status=JoinRequestStatus.PENDING, limit=50, db=db, admin_user=user
+        ),
+        "get_current_user": lambda db: get_current_user(payload=payload, db=db),
+        "verify_telegram_init_data": lambda db: verify_telegram_init_data(
+            init_data, settings.bot_token, settings.webapp_auth_max_age_seconds
+        ),
+    }
+
+
+def measure(func: Callable[[Session], object], min_runs: int, min_seconds: float, max_runs: int) -> list[float]:
+    with SessionLocal() as db:
+        func(db)
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() - started < min_seconds):
+        call_started = time.perf_counter()
+        with SessionLocal() as db:
+            func(db)
+        timings.append((time.perf_counter() - call_started) * 1000)
+    return timings
+
+
+def capture_selects(func: Callable[[Session], object]) -> list[tuple[str, object]]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with SessionLocal() as db:
+            func(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def explain(statement: str, parameters: object) -> list[str]:
+    with engine.connect() as connection:
+        with connection.connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            plan = [row[0] for row in cursor.fetchall()]
+        connection.rollback()
+    return plan
+
+
+def dataset_counts() -> dict[str, int]:
+    with SessionLocal() as db:
+        return {
+            "users": db.scalar(select(func.count()).select_from(User)),
+            "join_requests": db.scalar(select(func.count()).select_from(JoinRequest)),
+            "scores": db.scalar(select(func.count()).select_from(Score)),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's medians as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed median slowdown, as a fraction")
+    parser.add_argument("--noise-ms", type=float, default=0.5, help="slowdowns below this many ms never fail")
+    parser.add_argument("--only", default="", help="comma-separated benchmark name prefixes")
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--max-runs", type=int, default=2000)
+    parser.add_argument("--no-explain", action="store_true")
+    args = parser.parse_args()
+
+    counts = dataset_counts()
+    print("dataset: " + ", ".join(f"{table}={count:,}" for table, count in counts.items()))
+    with SessionLocal() as db:
+        user = db.scalar(select(User).where(User.status == UserStatus.APPROVED).order_by(User.id).limit(1))
+        if user is None:
+            raise SystemExit("no approved users; seed the database with scripts.seed_dataset first")
+        db.expunge(user)
+
+    prefixes = [prefix.strip() for prefix in args.only.split(",") if prefix.strip()]
+    benchmarks = {
+        name: func
+        for name, func in build_benchmarks(user).items()
+        if not prefixes or name.startswith(tuple(prefixes))
+    }
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() and not args.save_baseline else None
+    if baseline and baseline["dataset"] != counts:
+        raise SystemExit(f"dataset differs from baseline {baseline['dataset']}; reseed or pass --save-baseline")
+
+    results: dict[str, dict[str, float]] = {}
+    regressions = []
+    print(f"\n{'benchmark':<30}{'runs':>7}{'min ms':>11}{'median ms':>11}{'p95 ms':>11}{'baseline':>11}{'change':>9}")
+    for name, func in benchmarks.items():
+        timings = measure(func, args.min_runs, args.min_seconds, args.max_runs)
+        median = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else timings[0]
+        results[name] = {"median_ms": round(median, 4), "p95_ms": round(p95, 4)}
+
+        previous = baseline["results"].get(name) if baseline else None
+        change = ""
+        if previous:
+            reference = previous["median_ms"]
+            change = f"{(median - reference) / reference:+.0%}"
+            if median > reference * (1 + args.tolerance) and median - reference > args.noise_ms:
+                regressions.append(name)
+                change += " !"
+        print(
+            f"{name:<30}{len(timings):>7}{min(timings):>11.3f}{median:>11.3f}{p95:>11.3f}"
+            f"{previous['median_ms'] if previous else '-':>11}{change:>9}"
+        )
+
+    if not args.no_explain:
+        for name, func in benchmarks.items():
+            for index, (statement, parameters) in enumerate(capture_selects(func), start=1):
+                print(f"\n-- {name} query {index}")
+                print("\n".join(explain(statement, parameters)))
+
+    if args.save_baseline:
+        # Keep entries for benchmarks skipped by --only when the dataset is unchanged.
+        saved = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        if saved.get("dataset") == counts:
+            results = {**saved["results"], **results}
+        args.baseline.write_text(json.dumps({"dataset": counts, "results": results}, indent=2) + "\n")
+        print(f"\nbaseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"\nno baseline at {args.baseline}; run with --save-baseline to create one")
+    if regressions:
+        print(f"\nregressed past baseline (+{args.tolerance:.0%}): {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
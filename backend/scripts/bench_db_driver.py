@@ -0,0 +1,104 @@
+"""Compare per-request database time of hot endpoints under psycopg2 and psycopg 3.
+
+Usage (from the backend directory, against a database with at least one approved user):
+    python -m scripts.bench_db_driver --requests 2000
+    python -m scripts.bench_db_driver --only submit_score --prepare-threshold 0
+
+Each request opens a session, loads the current user as the auth dependency does
+and calls the route function, so the statement sequence matches a real request.
+psycopg 3 runs twice: without server-side prepared statements, and with them
+(--prepare-threshold executions before a statement is prepared). submit_score
+writes real rows. psycopg 3 needs a UTF8 database.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from typing import Callable
+
+from sqlalchemy import make_url, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.api.deps import get_current_user
+from app.api.routers import access, game
+from app.core.config import get_settings
+from app.db.session import build_engine
+from app.models import User
+from app.models.enums import Difficulty, UserStatus
+from app.schemas.game import ScoreCreate
+
+
+def build_requests(payload: dict) -> dict[str, Callable[[Session], object]]:
+    def access_status(db: Session) -> object:
+        return access.get_access_status(current_user=get_current_user(payload=payload, db=db), db=db)
+
+    def leaderboard(db: Session) -> object:
+        return game.get_leaderboard(
+            difficulty=Difficulty.EASY, db=db, current_user=get_current_user(payload=payload, db=db)
+        )
+
+    def submit_score(db: Session) -> object:
+        score = ScoreCreate(difficulty=Difficulty.HARD, score=1, game_id=uuid.uuid4())
+        return game.submit_score(payload=score, db=db, current_user=get_current_user(payload=payload, db=db))
+
+    return {
+        "get_current_user": lambda db: get_current_user(payload=payload, db=db),
+        "get_access_status": access_status,
+        "get_leaderboard": leaderboard,
+        "submit_score": submit_score,
+    }
+
+
+def run(sessions: sessionmaker, func: Callable[[Session], object], count: int) -> list[float]:
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        with sessions() as db:
+            func(db)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="timed requests per endpoint and driver")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--prepare-threshold", type=int, default=get_settings().database_prepare_threshold)
+    parser.add_argument("--only", default="", help="comma-separated endpoint names")
+    args = parser.parse_args()
+
+    url = make_url(get_settings().database_url)
+    modes = {
+        "psycopg2": build_engine(url.set(drivername="postgresql+psycopg2")),
+        "psycopg": build_engine(url.set(drivername="postgresql+psycopg"), prepare_threshold=None),
+        "psycopg+prepared": build_engine(url.set(drivername="postgresql+psycopg"), args.prepare_threshold),
+    }
+
+    with sessionmaker(bind=modes["psycopg2"])() as db:
+        user = db.scalar(select(User).where(User.status == UserStatus.APPROVED).order_by(User.id).limit(1))
+        if user is None:
+            raise SystemExit("no approved users; seed the database with scripts.seed_dataset first")
+        payload = {"sub": str(user.id), "telegram_id": user.telegram_id}
+
+    names = [name.strip() for name in args.only.split(",") if name.strip()]
+    requests = {name: func for name, func in build_requests(payload).items() if not names or name in names}
+
+    print(f"{'endpoint':<20}{'driver':<20}{'median ms':>11}{'p95 ms':>11}{'vs psycopg2':>13}")
+    for name, func in requests.items():
+        reference = None
+        for mode, engine in modes.items():
+            sessions = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+            run(sessions, func, args.warmup)
+            timings = run(sessions, func, args.requests)
+            median = statistics.median(timings)
+            p95 = statistics.quantiles(timings, n=20)[18]
+            reference = reference or median
+            print(f"{name:<20}{mode:<20}{median:>11.3f}{p95:>11.3f}{median / reference - 1:>+13.0%}")
+
+    for engine in modes.values():
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark the in-memory leaderboard rank index.
+
+Usage (from the backend directory):
+    python -m scripts.bench_rank_index --players 1000000
+"""
+
+import argparse
+import random
+import time
+
+from app.schemas.game import MAX_SCORE
+from app.services.rank_index import RankIndex
+
+
+def _rate(label: str, count: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24}{count / elapsed:>14,.0f} ops/s{elapsed * 1e6 / count:>12.2f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Long-tailed scores: most players cluster low, a few reach the top of the range.
+    scores = [min(MAX_SCORE, int(rng.paretovariate(1.2) * 100) - 100) for _ in range(args.players)]
+
+    index = RankIndex(MAX_SCORE)
+    started = time.perf_counter()
+    index.load((user_id, score) for user_id, score in enumerate(scores, start=1))
+    print(f"load {args.players:,} players  {time.perf_counter() - started:.2f}s, {index.nbytes() / 2**20:.1f} MiB")
+
+    user_ids = [rng.randint(1, args.players) for _ in range(args.ops)]
+
+    started = time.perf_counter()
+    for user_id in user_ids:
+        index.rank_of(user_id)
+    _rate("rank_of", args.ops, started)
+
+    started = time.perf_counter()
+    for _ in range(args.ops // 10):
+        index.top(10)
+    _rate("top(10)", args.ops // 10, started)
+
+    offsets = [rng.randint(0, args.players - 50) for _ in range(args.ops // 10)]
+    started = time.perf_counter()
+    for offset in offsets:
+        list(index.iter_range(offset, 50))
+    _rate("iter_range(offset, 50)", len(offsets), started)
+
+    started = time.perf_counter()
+    for user_id in user_ids:
+        index.update(user_id, rng.randint(0, MAX_SCORE))
+    _rate("update", args.ops, started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compare session token encode/decode throughput of the available codecs.
+
+Usage (from the backend directory):
+    python -m scripts.bench_session_tokens --iterations 50000
+"""
+
+import argparse
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.core.security import TOKEN_CODECS
+
+SECRET = "bench-secret-" + "x" * 32
+
+
+def _throughput(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    now = datetime.now(UTC)
+    payload = {
+        "sub": "123456",
+        "telegram_id": 987654321,
+        "exp": int((now + timedelta(hours=24)).timestamp()),
+        "auth_time": int(now.timestamp()),
+    }
+
+    print(f"{'codec':<8}{'encode/s':>14}{'decode/s':>14}")
+    for name, codec in TOKEN_CODECS.items():
+        token = codec.encode(payload, SECRET)
+        for other in TOKEN_CODECS.values():
+            assert other.decode(token, SECRET)["sub"] == payload["sub"]
+
+        encode_rate = _throughput(lambda: codec.encode(payload, SECRET), args.iterations)
+        decode_rate = _throughput(lambda: codec.decode(token, SECRET), args.iterations)
+        print(f"{name:<8}{encode_rate:>14,.0f}{decode_rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
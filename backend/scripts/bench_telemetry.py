@@ -0,0 +1,97 @@
+"""Benchmark decoding and storing binary game telemetry batches.
+
+Usage (from the backend directory):
+    python -m scripts.bench_telemetry --records 500 --batches 2000
+    python -m scripts.bench_telemetry --records 500 --batches 200 --db
+"""
+
+import argparse
+import random
+import time
+import uuid
+import zlib
+
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models import User
+from app.services.telemetry import (
+    BATCH_ZLIB,
+    HEADER,
+    MAGIC,
+    RECORD,
+    RECORD_DIED,
+    VERSION,
+    append_batch,
+    decode_batch,
+    to_copy_rows,
+)
+
+
+def make_batch(rng: random.Random, records: int, compress: bool) -> bytes:
+    payload = bytearray()
+    for _ in range(records):
+        duration = rng.randint(5_000, 600_000)
+        died = rng.random() < 0.9
+        shots = rng.randint(0, duration // 70)
+        payload += RECORD.pack(
+            uuid.uuid4().bytes,
+            rng.randrange(3),
+            RECORD_DIED if died else 0,
+            duration,
+            duration if died else 0,
+            shots,
+            rng.randint(0, shots),
+            duration // 600,
+            rng.randint(0, 20_000),
+        )
+    if compress:
+        payload = zlib.compress(payload, 6)
+    return HEADER.pack(MAGIC, VERSION, BATCH_ZLIB if compress else 0, records) + payload
+
+
+def _rate(label: str, records: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28}{records / elapsed:>14,.0f} records/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=500, help="records per batch")
+    parser.add_argument("--batches", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", action="store_true", help="also COPY batches into game_telemetry (rolled back)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    total = args.records * args.batches
+    for compress in (False, True):
+        batches = [make_batch(rng, args.records, compress) for _ in range(min(args.batches, 50))]
+        label = "zlib" if compress else "raw"
+        print(f"{label}: {len(batches[0]) / args.records:.1f} bytes/record")
+
+        started = time.perf_counter()
+        for i in range(args.batches):
+            for _ in decode_batch(batches[i % len(batches)], args.records):
+                pass
+        _rate(f"decode {label}", total, started)
+
+        started = time.perf_counter()
+        for i in range(args.batches):
+            to_copy_rows(1, decode_batch(batches[i % len(batches)], args.records))
+        _rate(f"decode + COPY rows {label}", total, started)
+
+    if args.db:
+        with SessionLocal() as db:
+            user_id = db.scalar(select(User.id).limit(1))
+            if user_id is None:
+                raise SystemExit("--db needs at least one user row")
+            started = time.perf_counter()
+            for i in range(args.batches):
+                append_batch(db, user_id, decode_batch(batches[i % len(batches)], args.records))
+            _rate("decode + COPY into Postgres", total, started)
+            db.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Publish and watch cache invalidation events on the Postgres LISTEN/NOTIFY bus.
+
+Usage (from the backend directory, in two terminals against the same database):
+    python -m scripts.cache_bus listen
+    python -m scripts.cache_bus publish leaderboard --user-id 1 --difficulty easy --score 500
+    python -m scripts.cache_bus publish user_status --user-id 1 --status REJECTED
+
+Events published here come from a foreign origin, so running backend workers apply them.
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.db.session import SessionLocal
+from app.models.enums import Difficulty, UserStatus
+from app.services import cache_bus
+
+
+def print_event(origin: str, event: cache_bus.Event) -> None:
+    print(f"{time.strftime('%H:%M:%S')} {origin[:8]} {event}", flush=True)
+
+
+async def listen() -> None:
+    await cache_bus.CacheBusListener(on_event=print_event).run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("listen")
+    publish = commands.add_parser("publish")
+    publish.add_argument("type", choices=list(cache_bus.EVENT_TYPES))
+    publish.add_argument("--user-id", type=int, required=True)
+    publish.add_argument("--difficulty", choices=[item.value for item in Difficulty], default=Difficulty.EASY.value)
+    publish.add_argument("--score", type=int, default=0)
+    publish.add_argument("--status", choices=[item.value for item in UserStatus], default=UserStatus.APPROVED.value)
+    args = parser.parse_args()
+
+    if args.command == "listen":
+        asyncio.run(listen())
+        return
+
+    if args.type == "leaderboard":
+        event = cache_bus.LeaderboardChanged(Difficulty(args.difficulty), args.user_id, args.score)
+    elif args.type == "user_profile":
+        event = cache_bus.UserProfileChanged(args.user_id)
+    else:
+        event = cache_bus.UserStatusChanged(args.user_id, UserStatus(args.status))
+    with SessionLocal() as db:
+        cache_bus.publish(db, event)
+        db.commit()
+    print(f"published {event}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Fire concurrent access requests for one user and check that exactly one goes through.
+
+Usage (from the backend directory, against a development database):
+    python -m scripts.check_access_request_race --parallel 10
+
+Creates a throwaway user, calls create_access_request from --parallel threads at
+once (each with its own session, like separate HTTP requests) and counts the
+admin notifications with a local stand-in for the bot's internal API. Exits with
+status 1 unless exactly one pending request and one notification exist. The user
+is deleted and stats counters reconciled afterwards.
+"""
+
+import argparse
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+
+from app.api.routers.access import create_access_request
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models import JoinRequest, User
+from app.models.enums import JoinRequestStatus, UserStatus
+from app.schemas.access import AccessRequestCreate
+from app.services.stats import reconcile
+
+TELEGRAM_ID = 9_000_000_000_000
+
+
+class _BotStub(BaseHTTPRequestHandler):
+    notifications = 0
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            _BotStub.notifications += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"ok": true}')
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    # Each thread holds a pooled connection while it waits for the others, so stay
+    # within the pool (5 connections + 10 overflow by default).
+    parser.add_argument("--parallel", type=int, default=10)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BotStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings = get_settings().model_copy(
+        update={"bot_internal_url": f"http://127.0.0.1:{server.server_port}", "bot_internal_token": "race-check"}
+    )
+
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.telegram_id == TELEGRAM_ID))
+        user = User(telegram_id=TELEGRAM_ID, first_name="Race", status=UserStatus.NEW)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    barrier = threading.Barrier(args.parallel, timeout=30)
+    outcomes: list[str] = []
+
+    def submit(index: int) -> None:
+        with SessionLocal() as db:
+            current_user = db.get(User, user_id)
+            barrier.wait()
+            try:
+                create_access_request(
+                    AccessRequestCreate(comment=f"attempt {index}"), db=db, current_user=current_user, settings=settings
+                )
+                outcomes.append("created")
+            except HTTPException as exc:
+                outcomes.append(f"{exc.status_code} {exc.detail}")
+
+    threads = [threading.Thread(target=submit, args=(index,)) for index in range(args.parallel)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+
+    with SessionLocal() as db:
+        pending = db.scalar(
+            select(func.count())
+            .select_from(JoinRequest)
+            .where(JoinRequest.user_id == user_id, JoinRequest.status == JoinRequestStatus.PENDING)
+        )
+        status = db.scalar(select(User.status).where(User.id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        reconcile(db, days=1)
+        db.commit()
+
+    for outcome in sorted(set(outcomes)):
+        print(f"{outcomes.count(outcome):>4} x {outcome}")
+    print(f"pending requests: {pending}, notifications: {_BotStub.notifications}, user status: {status.value}")
+    if pending != 1 or _BotStub.notifications != 1 or outcomes.count("created") != 1:
+        print("FAILED: expected exactly one request and one notification", file=sys.stderr)
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Hold many live leaderboard WebSockets against a local backend and check fan-out and memory.
+
+Usage (from the backend directory, against a development database):
+    python -m scripts.check_live_leaderboard --connections 10000 --rounds 3 --burst 50
+
+Starts uvicorn on a free port with the flags of scripts/start.sh (rate limits
+off), creates --players throwaway approved users, opens --connections sockets to
+/api/game/leaderboard/live as one of them, then submits --burst scores per round.
+Reports the server's RSS per connection, how many deltas each burst became and
+when the last one reached every client.
+Exits with status 1 if a socket was dropped, a client missed the final version
+or the server grew by more than --max-kb-per-connection. Users are deleted and
+stats counters reconciled afterwards. Needs a file descriptor limit above the
+connection count for both processes.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete
+from websockets.asyncio.client import connect
+
+from app.core.config import get_settings
+from app.core.security import create_session_token
+from app.db.session import SessionLocal
+from app.models import User
+from app.models.enums import UserStatus
+from app.services.stats import reconcile
+
+TELEGRAM_ID_BASE = 9_000_000_001_000
+BASELINE_CONNECTIONS = 100
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS not found")
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Clients:
+    def __init__(self, count: int) -> None:
+        self.versions = [0] * count
+        self.deltas = [0] * count
+        self.last_message = [0.0] * count
+        self.closed: dict[int, str] = {}
+        self.connected = 0
+
+    async def run(self, index: int, url: str, cookie: str, limit: asyncio.Semaphore) -> None:
+        async with limit:
+            websocket = await connect(url, additional_headers={"Cookie": cookie}, open_timeout=120, ping_interval=None)
+            self.versions[index] = json.loads(await websocket.recv())["version"]
+            self.connected += 1
+        try:
+            async for raw in websocket:
+                self.versions[index] = json.loads(raw)["version"]
+                self.deltas[index] += 1
+                self.last_message[index] = time.monotonic()
+        finally:
+            if websocket.close_code is not None and websocket.close_code != 1000:
+                self.closed[index] = f"{websocket.close_code} {websocket.close_reason}"
+
+
+async def wait_settled(clients: Clients, quiet: float, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    settled_since = None
+    while time.monotonic() < deadline:
+        if min(clients.versions) == max(clients.versions):
+            settled_since = settled_since or time.monotonic()
+            if time.monotonic() - settled_since >= quiet:
+                return
+        else:
+            settled_since = None
+        await asyncio.sleep(0.05)
+
+
+async def check(args: argparse.Namespace, port: int, pid: int, cookies: list[str]) -> bool:
+    base = f"http://127.0.0.1:{port}"
+    url = f"ws://127.0.0.1:{port}/api/game/leaderboard/live?difficulty={args.difficulty}"
+    coalesce = get_settings().live_leaderboard_coalesce_ms / 1000
+    clients = Clients(args.connections)
+    limit = asyncio.Semaphore(args.concurrency)
+    tasks = []
+
+    def start(indexes: range) -> None:
+        for index in indexes:
+            tasks.append(asyncio.create_task(clients.run(index, url, random.choice(cookies), limit)))
+
+    async def wait_connected(count: int) -> None:
+        while clients.connected + len(clients.closed) < count:
+            for task in tasks:
+                if task.done() and task.exception() is not None:
+                    raise task.exception()
+            await asyncio.sleep(0.05)
+
+    started = time.monotonic()
+    start(range(BASELINE_CONNECTIONS))
+    await wait_connected(BASELINE_CONNECTIONS)
+    baseline = rss_kb(pid)
+    start(range(BASELINE_CONNECTIONS, args.connections))
+    await wait_connected(args.connections)
+    connected_rss = rss_kb(pid)
+    per_connection = (connected_rss - baseline) / (args.connections - BASELINE_CONNECTIONS)
+    print(f"connected {clients.connected} sockets in {time.monotonic() - started:.1f}s")
+    print(
+        f"server RSS: {baseline / 1024:.1f} MiB at {BASELINE_CONNECTIONS}, {connected_rss / 1024:.1f} MiB at "
+        f"{args.connections} ({per_connection:.1f} KiB per connection)"
+    )
+
+    ok = per_connection <= args.max_kb_per_connection
+    rng = random.Random(1)
+    async with httpx.AsyncClient(base_url=base, timeout=30) as http:
+        for round_number in range(1, args.rounds + 1):
+            deltas_before = list(clients.deltas)
+            cpu_before = cpu_seconds(pid)
+            burst_started = time.monotonic()
+            for _ in range(args.burst):
+                response = await http.post(
+                    "/api/game/score",
+                    json={"difficulty": args.difficulty, "score": rng.randrange(1_000_000), "game_id": str(uuid.uuid4())},
+                    headers={"Cookie": rng.choice(cookies)},
+                )
+                response.raise_for_status()
+            burst_done = time.monotonic()
+            await wait_settled(clients, quiet=coalesce * 4, timeout=60)
+            received = [after - before for after, before in zip(clients.deltas, deltas_before)]
+            delivered = max(clients.last_message) - burst_started
+            print(
+                f"round {round_number}: {args.burst} submits in {burst_done - burst_started:.2f}s -> "
+                f"{min(received)}..{max(received)} deltas per client"
+                + (f", all delivered {delivered:.2f}s after the first submit" if max(received) else "")
+                + f", version {max(clients.versions)}, server CPU {cpu_seconds(pid) - cpu_before:.2f}s, "
+                f"RSS {rss_kb(pid) / 1024:.1f} MiB"
+            )
+            if min(clients.versions) != max(clients.versions):
+                ok = False
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if clients.closed:
+        print(f"{len(clients.closed)} sockets closed by the server, e.g. {next(iter(clients.closed.values()))}")
+        ok = False
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--burst", type=int, default=50, help="score submits per round")
+    parser.add_argument("--difficulty", default="easy")
+    parser.add_argument("--concurrency", type=int, default=200, help="sockets being opened at once")
+    parser.add_argument("--max-kb-per-connection", type=float, default=64)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if hard < args.connections + 1000:
+        raise SystemExit(f"file descriptor limit {hard} is too low for {args.connections} connections")
+
+    telegram_ids = [TELEGRAM_ID_BASE + index for index in range(args.players)]
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.telegram_id.in_(telegram_ids)))
+        users = [
+            User(telegram_id=telegram_id, first_name=f"Live {index}", status=UserStatus.APPROVED)
+            for index, telegram_id in enumerate(telegram_ids)
+        ]
+        db.add_all(users)
+        db.commit()
+        cookie_name = get_settings().session_cookie_name
+        cookies = [f"{cookie_name}={create_session_token(user.id, user.telegram_id)}" for user in users]
+
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--ws-per-message-deflate",
+            "false",
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, "RATE_LIMIT_ENABLED": "false"},
+    )
+    try:
+        for _ in range(300):
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.1)
+        ok = asyncio.run(check(args, port, server.pid, cookies))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        with SessionLocal() as db:
+            db.execute(delete(User).where(User.telegram_id.in_(telegram_ids)))
+            db.commit()
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            reconcile(db, days=1)
+            db.commit()
+
+    if not ok:
+        print("FAILED", file=sys.stderr)
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Stream users, join requests and scores to and from compressed CSV/NDJSON files.
+
+Usage (from the backend directory):
+    python -m scripts.data_transfer export --dir dump --format csv
+    python -m scripts.data_transfer import --dir dump --batch-size 50000
+
+Export uses COPY (CSV) or a server-side cursor (NDJSON); import feeds COPY in
+batches, committing after each one. Memory use stays flat regardless of table size.
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from app.db.session import copy_from, copy_to, engine
+from app.models import JoinRequest, Score, User
+
+# Parents before children so foreign keys resolve on import.
+TABLES = {model.__tablename__: [column.name for column in model.__table__.columns] for model in (User, JoinRequest, Score)}
+FORMATS = ("csv", "ndjson")
+NULL = "\\N"
+
+
+class Progress:
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def add(self, rows: int) -> None:
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self._last_report >= 2:
+            self._last_report = now
+            self._print(now, final=False)
+
+    def done(self) -> None:
+        self._print(time.perf_counter(), final=True)
+
+    def _print(self, now: float, final: bool) -> None:
+        elapsed = max(now - self.started, 1e-9)
+        suffix = "done" if final else "..."
+        print(f"{self.label}: {self.rows:,} rows, {self.rows / elapsed:,.0f} rows/s, {elapsed:.1f}s {suffix}", file=sys.stderr)
+
+
+def _path(directory: Path, table: str, fmt: str) -> Path:
+    return directory / f"{table}.{fmt}.gz"
+
+
+class _CountingWriter(io.RawIOBase):
+    def __init__(self, target, progress: Progress) -> None:
+        self.target = target
+        self.progress = progress
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.progress.add(bytes(data).count(b"\n"))
+        return self.target.write(data)
+
+
+def export_table(connection, table: str, columns: list[str], path: Path, fmt: str, batch_size: int) -> None:
+    progress = Progress(f"export {table}")
+    column_list = ", ".join(columns)
+    with gzip.open(path, "wb", compresslevel=6) as target:
+        if fmt == "csv":
+            with connection.cursor() as cursor:
+                # Counts output lines, so the live rate is approximate for multi-line values; the final count is exact.
+                copy_to(
+                    cursor,
+                    f"COPY (SELECT {column_list} FROM {table} ORDER BY id) TO STDOUT WITH (FORMAT csv, HEADER true, NULL '\\N')",
+                    _CountingWriter(target, progress),
+                )
+                progress.rows = cursor.rowcount
+        else:
+            with connection.cursor(name=f"export_{table}") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(f"SELECT row_to_json(t)::text FROM (SELECT {column_list} FROM {table} ORDER BY id) t")
+                while rows := cursor.fetchmany(batch_size):
+                    target.write("".join(f"{row[0]}\n" for row in rows).encode("utf-8"))
+                    progress.add(len(rows))
+    connection.commit()
+    progress.done()
+
+
+def _read_rows(path: Path, fmt: str, columns: list[str]):
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as source:
+        if fmt == "csv":
+            reader = csv.reader(source)
+            header = next(reader, None)
+            if header != columns:
+                raise SystemExit(f"{path}: unexpected header {header}, expected {columns}")
+            yield from reader
+        else:
+            for line in source:
+                if line.strip():
+                    record = json.loads(line)
+                    yield [record.get(column) for column in columns]
+
+
+def _copy_batch(connection, table: str, columns: list[str], rows: list[list]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # \N marks NULL in both directions so empty strings survive the round trip.
+    writer.writerows([NULL if value is None else value for value in row] for row in rows)
+    with connection.cursor() as cursor:
+        copy_from(cursor, f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer.getvalue())
+    connection.commit()
+
+
+def import_table(connection, table: str, columns: list[str], path: Path, fmt: str, batch_size: int) -> None:
+    progress = Progress(f"import {table}")
+    batch: list[list] = []
+    for row in _read_rows(path, fmt, columns):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _copy_batch(connection, table, columns, batch)
+            progress.add(len(batch))
+            batch = []
+    if batch:
+        _copy_batch(connection, table, columns, batch)
+        progress.add(len(batch))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+    connection.commit()
+    progress.done()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("--dir", type=Path, required=True)
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="export format; import detects it per file")
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), default=list(TABLES))
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    tables = [table for table in TABLES if table in args.tables]
+    connection = engine.raw_connection()
+    try:
+        if args.command == "export":
+            args.dir.mkdir(parents=True, exist_ok=True)
+            for table in tables:
+                export_table(connection, table, TABLES[table], _path(args.dir, table, args.format), args.format, args.batch_size)
+        else:
+            for table in tables:
+                fmt = next((fmt for fmt in FORMATS if _path(args.dir, table, fmt).exists()), None)
+                if fmt is None:
+                    print(f"skip {table}: no dump file in {args.dir}", file=sys.stderr)
+                    continue
+                import_table(connection, table, TABLES[table], _path(args.dir, table, fmt), fmt, args.batch_size)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
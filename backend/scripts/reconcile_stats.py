@@ -0,0 +1,34 @@
+"""Recount admin dashboard counters from source tables and correct any drift.
+
+Usage (from the backend directory, e.g. nightly from cron):
+    python -m scripts.reconcile_stats --days 7
+    python -m scripts.reconcile_stats --days 7 --dry-run
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.stats import reconcile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=7, help="daily buckets to recount, ending today (UTC)")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        corrections = reconcile(db, args.days)
+        if args.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+
+    for day, name, key, drift in corrections:
+        print(f"{day} {name:<18}{key:<12}{drift:+d}")
+    print(f"{len(corrections)} counters {'would be ' if args.dry_run else ''}corrected")
+
+
+if __name__ == "__main__":
+    main()
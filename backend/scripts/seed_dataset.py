@@ -0,0 +1,167 @@
+"""Bulk-seed a deterministic synthetic dataset of users, join requests and scores.
+
+Usage (from the backend directory, against an empty database):
+    python -m scripts.seed_dataset --users 100000 --scores 10000000
+    python -m scripts.seed_dataset --users 5000 --scores 200000 --seed 7 --truncate
+
+The same --seed and volumes always produce the same rows, so benchmark runs on
+different machines or branches see identical data. Scores are skewed the way
+real traffic is: most games are on easy, and a few players account for most of
+them. Rows are streamed through COPY, then stats counters are reconciled.
+"""
+
+import argparse
+import itertools
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal, copy_from, engine
+from app.models.enums import Difficulty, JoinRequestStatus, UserStatus
+from app.services.stats import reconcile
+
+# Fixed epoch instead of now(), so timestamps are part of the deterministic output.
+EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+SPAN_SECONDS = 180 * 24 * 3600
+
+STATUS_WEIGHTS = {UserStatus.APPROVED: 80, UserStatus.REQUESTED: 8, UserStatus.REJECTED: 4, UserStatus.NEW: 8}
+DIFFICULTY_WEIGHTS = {Difficulty.EASY: 65, Difficulty.NORMAL: 25, Difficulty.HARD: 10}
+# Median score per difficulty; harder games end sooner.
+SCORE_MEDIANS = {Difficulty.EASY: 1200, Difficulty.NORMAL: 700, Difficulty.HARD: 300}
+FIRST_NAMES = ("Alex", "Maria", "Ivan", "Olga", "Dmitry", "Anna", "Sergey", "Elena", "Pavel", "Nina")
+TELEGRAM_ID_BASE = 7_000_000_000
+BATCH_ROWS = 100_000
+
+
+def _timestamp(offset_seconds: float) -> str:
+    return (EPOCH + timedelta(seconds=offset_seconds)).isoformat()
+
+
+def _copy(cursor, table: str, columns: str, lines) -> int:
+    total = 0
+    for batch in iter(lambda: list(itertools.islice(lines, BATCH_ROWS)), []):
+        copy_from(cursor, f"COPY {table} ({columns}) FROM STDIN", "".join(batch))
+        total += len(batch)
+    return total
+
+
+def _rate(label: str, count: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"{label:<14}{count:>12,} rows {elapsed:>8.1f}s {count / max(elapsed, 1e-9):>12,.0f} rows/s")
+
+
+def generate_users(rng: random.Random, users: list[tuple[int, UserStatus]]):
+    for user_id, status in users:
+        created = _timestamp(SPAN_SECONDS * (user_id - 1) / len(users))
+        first_name = FIRST_NAMES[rng.randrange(len(FIRST_NAMES))]
+        username = f"pilot_{user_id}" if rng.random() < 0.8 else "\\N"
+        last_name = f"Test{user_id % 997}" if rng.random() < 0.5 else "\\N"
+        yield (
+            f"{user_id}\t{TELEGRAM_ID_BASE + user_id}\t{username}\t{first_name}\t{last_name}\t\\N\t"
+            f"{status.value}\t{created}\t{created}\n"
+        )
+
+
+def generate_requests(users: list[tuple[int, UserStatus]]):
+    decisions = {
+        UserStatus.REQUESTED: JoinRequestStatus.PENDING,
+        UserStatus.APPROVED: JoinRequestStatus.APPROVED,
+        UserStatus.REJECTED: JoinRequestStatus.REJECTED,
+    }
+    request_id = 0
+    for user_id, status in users:
+        if status not in decisions:
+            continue
+        request_id += 1
+        decision = decisions[status]
+        offset = SPAN_SECONDS * (user_id - 1) / len(users)
+        created = _timestamp(offset + 60)
+        decided = "\\N" if decision is JoinRequestStatus.PENDING else _timestamp(offset + 3600)
+        admin = "\\N" if decision is JoinRequestStatus.PENDING else "1"
+        yield (
+            f"{request_id}\t{user_id}\t{decision.value}\tseeded\t\\N\t{admin}\t{created}\t{decided}\t\\N\t\\N\n"
+        )
+
+
+def generate_scores(rng: random.Random, players: list[int], count: int):
+    # Pareto-distributed activity: a small share of players plays most games.
+    activity = [rng.paretovariate(1.2) for _ in players]
+    difficulties = list(DIFFICULTY_WEIGHTS)
+    difficulty_weights = list(DIFFICULTY_WEIGHTS.values())
+    chunk = 10_000
+    for start in range(0, count, chunk):
+        size = min(chunk, count - start)
+        owners = rng.choices(players, weights=activity, k=size)
+        levels = rng.choices(difficulties, weights=difficulty_weights, k=size)
+        for offset, (user_id, difficulty) in enumerate(zip(owners, levels)):
+            score_id = start + offset + 1
+            score = int(rng.lognormvariate(0, 0.8) * SCORE_MEDIANS[difficulty])
+            created = _timestamp(SPAN_SECONDS * score_id / count)
+            yield f"{score_id}\t{user_id}\t{difficulty.value}\t{score}\t\\N\t{created}\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--scores", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="delete existing users, requests, scores and counters first")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with engine.begin() as connection:
+        if args.truncate:
+            connection.execute(text("TRUNCATE users, join_requests, scores, stats_counters, game_telemetry"))
+        elif connection.execute(text("SELECT EXISTS (SELECT 1 FROM users)")).scalar():
+            raise SystemExit("users table is not empty; pass --truncate to replace its contents")
+
+        with connection.connection.cursor() as cursor:
+            started = time.perf_counter()
+            statuses = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=args.users)
+            users = list(enumerate(statuses, start=1))
+            count = _copy(
+                cursor,
+                "users",
+                "id, telegram_id, username, first_name, last_name, photo_url, status, created_at, updated_at",
+                generate_users(rng, users),
+            )
+            _rate("users", count, started)
+
+            started = time.perf_counter()
+            count = _copy(
+                cursor,
+                "join_requests",
+                "id, user_id, status, comment, decision_reason, decided_by_admin_tg_id, created_at, decided_at, "
+                "claimed_by_admin_tg_id, claimed_until",
+                generate_requests(users),
+            )
+            _rate("join_requests", count, started)
+
+            players = [user_id for user_id, status in users if status is UserStatus.APPROVED]
+            started = time.perf_counter()
+            count = _copy(
+                cursor,
+                "scores",
+                "id, user_id, difficulty, score, client_game_id, created_at",
+                generate_scores(rng, players, args.scores) if players else iter(()),
+            )
+            _rate("scores", count, started)
+
+            for table in ("users", "join_requests", "scores"):
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+                )
+        connection.execute(text("ANALYZE users, join_requests, scores"))
+
+    with SessionLocal() as db:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        corrections = reconcile(db, days=(datetime.now(UTC) - EPOCH).days + 1)
+        db.commit()
+    print(f"stats counters: {len(corrections)} corrections written")
+
+
+if __name__ == "__main__":
+    main()
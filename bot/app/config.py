@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     internal_api_host: str = "0.0.0.0"
     internal_api_port: int = 8081
 
+    update_workers: int = 16
+    max_pending_updates: int = 1000
+    max_pending_updates_per_chat: int = 20
+
     @field_validator("admin_telegram_ids", mode="before")
     @classmethod
     def parse_admin_ids(cls, value: str | list[int]) -> list[int]:
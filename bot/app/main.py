@@ -9,12 +9,25 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update, WebAppI
 from telegram.ext import Application, CommandHandler, ContextTypes
 
 from app.config import Settings, get_settings
+from app.updates import ChatOrderedUpdateProcessor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 application: Application | None = None
+update_processor: ChatOrderedUpdateProcessor | None = None
+
+ADMIN_IDS = frozenset(settings.admin_telegram_ids)
+START_KEYBOARD = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(text="Open Space Shooter", web_app=WebAppInfo(url=settings.mini_app_url))]]
+)
+ADMIN_PANEL_KEYBOARD = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(text="Open Admin Panel", web_app=WebAppInfo(url=f"{settings.mini_app_url}/admin"))]]
+)
+NEW_REQUEST_KEYBOARD = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(text="Open Admin", web_app=WebAppInfo(url=f"{settings.mini_app_url}/admin"))]]
+)
 
 
 class NewRequestPayload(BaseModel):
@@ -28,33 +41,32 @@ class NewRequestPayload(BaseModel):
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     del context
-    keyboard = InlineKeyboardMarkup(
-        [[InlineKeyboardButton(text="Open Space Shooter", web_app=WebAppInfo(url=settings.mini_app_url))]]
-    )
     await update.effective_chat.send_message(
         "Welcome! Open the Mini App and request access.",
-        reply_markup=keyboard,
+        reply_markup=START_KEYBOARD,
     )
 
 
 async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     del context
-    if update.effective_user is None or update.effective_user.id not in settings.admin_telegram_ids:
+    if update.effective_user is None or update.effective_user.id not in ADMIN_IDS:
         await update.effective_chat.send_message("Admin access required.")
         return
 
-    keyboard = InlineKeyboardMarkup(
-        [[InlineKeyboardButton(text="Open Admin Panel", web_app=WebAppInfo(url=f"{settings.mini_app_url}/admin"))]]
-    )
-    await update.effective_chat.send_message("Open admin panel:", reply_markup=keyboard)
+    await update.effective_chat.send_message("Open admin panel:", reply_markup=ADMIN_PANEL_KEYBOARD)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     del app
-    global application
+    global application, update_processor
 
-    application = Application.builder().token(settings.bot_token).build()
+    update_processor = ChatOrderedUpdateProcessor(
+        workers=settings.update_workers,
+        max_pending=settings.max_pending_updates,
+        max_pending_per_chat=settings.max_pending_updates_per_chat,
+    )
+    application = Application.builder().token(settings.bot_token).concurrent_updates(update_processor).build()
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("admin", admin_command))
 
@@ -84,6 +96,13 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict:
+    if application is None or update_processor is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Bot is not ready")
+    return {"update_queue": application.update_queue.qsize(), **update_processor.stats()}
+
+
 @app.post("/internal/new-request")
 async def notify_new_request(
     payload: NewRequestPayload,
@@ -108,13 +127,9 @@ async def notify_new_request(
         f"Comment: {comment_line}"
     )
 
-    keyboard = InlineKeyboardMarkup(
-        [[InlineKeyboardButton(text="Open Admin", web_app=WebAppInfo(url=f"{settings.mini_app_url}/admin"))]]
-    )
-
-    for admin_id in settings.admin_telegram_ids:
+    for admin_id in ADMIN_IDS:
         try:
-            await application.bot.send_message(chat_id=admin_id, text=message, reply_markup=keyboard)
+            await application.bot.send_message(chat_id=admin_id, text=message, reply_markup=NEW_REQUEST_KEYBOARD)
         except Exception as exc:
             logger.warning("Failed to notify admin %s: %s", admin_id, exc)
 
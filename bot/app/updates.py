@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Run updates of different chats on a bounded pool of workers, one chat at a time.
+
+    While a chat's update is being handled, later updates of that chat wait in a
+    per-chat backlog and are run by the same worker, so replies keep their order.
+    """
+
+    def __init__(self, workers: int, max_pending: int, max_pending_per_chat: int, latency_window: int = 1000) -> None:
+        # The base semaphore caps updates admitted here; workers are capped separately
+        # so waiting updates stay visible in the stats.
+        super().__init__(max_concurrent_updates=max_pending)
+        self.workers = workers
+        self.max_pending_per_chat = max_pending_per_chat
+        self._worker_slots = asyncio.BoundedSemaphore(workers)
+        self._backlogs: dict[int, deque[Awaitable[Any]]] = {}
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self.waiting = 0
+        self.active = 0
+        self.processed = 0
+        self.dropped = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await self._run_on_worker(None, coroutine)
+            return
+
+        backlog = self._backlogs.get(chat.id)
+        if backlog is not None:
+            if len(backlog) >= self.max_pending_per_chat:
+                self.dropped += 1
+                coroutine.close()
+                logger.warning("Dropped update for chat %s: %s already pending", chat.id, len(backlog))
+                return
+            backlog.append(coroutine)
+            return
+
+        self._backlogs[chat.id] = deque()
+        try:
+            await self._run_on_worker(chat.id, coroutine)
+        finally:
+            for pending in self._backlogs.pop(chat.id):
+                pending.close()
+
+    async def _run_on_worker(self, chat_id: int | None, coroutine: Awaitable[Any]) -> None:
+        self.waiting += 1
+        try:
+            await self._worker_slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            await self._run(coroutine)
+            backlog = self._backlogs.get(chat_id) if chat_id is not None else None
+            while backlog:
+                await self._run(backlog.popleft())
+        finally:
+            self.active -= 1
+            self._worker_slots.release()
+
+    async def _run(self, coroutine: Awaitable[Any]) -> None:
+        started = time.perf_counter()
+        try:
+            await coroutine
+        except Exception:
+            logger.exception("Update handler failed")
+        finally:
+            self._latencies.append(time.perf_counter() - started)
+            self.processed += 1
+
+    def stats(self) -> dict[str, Any]:
+        latencies = sorted(self._latencies)
+        return {
+            "workers": self.workers,
+            "active": self.active,
+            "waiting_for_worker": self.waiting,
+            "chat_backlog": sum(len(backlog) for backlog in self._backlogs.values()),
+            "busy_chats": len(self._backlogs),
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "handler_latency_ms": {
+                "samples": len(latencies),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+                "p95": round(latencies[int(len(latencies) * 0.95)] * 1000, 2) if latencies else None,
+                "max": round(latencies[-1] * 1000, 2) if latencies else None,
+            },
+        }
@@ -0,0 +1,137 @@
+"""Build content-hashed game assets: one sprite atlas plus resized backgrounds per scale.
+
+Usage (from the frontend directory; needs Pillow):
+    python scripts/build_game_assets.py
+    python scripts/build_game_assets.py --formats webp,png --scales 1
+
+Reads the source PNGs in public/game-assets and writes hashed files and
+manifest.json to public/game-assets/built. src/game/assets.ts loads the
+manifest and falls back to the source PNGs when it is missing.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import shutil
+from pathlib import Path
+
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT / "public" / "game-assets"
+OUTPUT_DIR = SOURCE_DIR / "built"
+
+# Game canvas size in CSS pixels (CANVAS_WIDTH / CANVAS_HEIGHT in PlayPage.tsx).
+CANVAS = (390, 640)
+
+# Sprite name -> bounding box at scale 1, a little above the largest size the engine draws.
+SPRITES = {
+    "ship_idle": 96,
+    "ship_fire": 96,
+    **{f"asteroid_{index:02d}": 128 for index in range(1, 11)},
+}
+BACKGROUNDS = {
+    "mobile": "background_mobile_9x16_1080x1920.png",
+    "desktop": "background_desktop_16x9_1920x1080.png",
+}
+PADDING = 2
+# Formats src/game/assets.ts knows how to pick from; PNG is the universal fallback.
+ENCODERS = {
+    "webp": {"quality": 82, "method": 6},
+    "png": {"optimize": True},
+}
+
+
+def _resize(image: Image.Image, scale: float) -> Image.Image:
+    scale = min(scale, 1.0)
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image if size == image.size else image.resize(size, Image.LANCZOS)
+
+
+def pack(sprites: dict[str, Image.Image]) -> tuple[Image.Image, dict[str, list[int]]]:
+    """Shelf-pack sprites, tallest first, into a roughly square atlas."""
+    order = sorted(sprites, key=lambda name: (-sprites[name].height, name))
+    area = sum((image.width + PADDING) * (image.height + PADDING) for image in sprites.values())
+    max_width = max(max(image.width for image in sprites.values()) + PADDING, int(area**0.5 * 1.1))
+
+    frames: dict[str, list[int]] = {}
+    x = y = shelf_height = width = 0
+    for name in order:
+        image = sprites[name]
+        if x and x + image.width > max_width:
+            x, y, shelf_height = 0, y + shelf_height + PADDING, 0
+        frames[name] = [x, y, image.width, image.height]
+        x += image.width + PADDING
+        shelf_height = max(shelf_height, image.height)
+        width = max(width, x - PADDING)
+
+    atlas = Image.new("RGBA", (width, y + shelf_height), (0, 0, 0, 0))
+    for name, (fx, fy, _, _) in frames.items():
+        atlas.paste(sprites[name], (fx, fy))
+    return atlas, frames
+
+
+def write_hashed(image: Image.Image, stem: str, fmt: str) -> str:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), **ENCODERS[fmt])
+    data = buffer.getvalue()
+    name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{fmt}"
+    (OUTPUT_DIR / name).write_bytes(data)
+    return name
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", default="webp,png", help=f"comma-separated, preferred first: {', '.join(ENCODERS)}")
+    # Only 1x until the game canvas renders at devicePixelRatio (see RENDER_SCALE in src/game/assets.ts).
+    parser.add_argument("--scales", default="1", help="comma-separated multiples of the canvas size")
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = set(formats) - ENCODERS.keys()
+    if unknown:
+        raise SystemExit(f"unknown formats: {', '.join(sorted(unknown))}")
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+    OUTPUT_DIR.mkdir(parents=True)
+
+    sources = {name: Image.open(SOURCE_DIR / f"{name}.png").convert("RGBA") for name in SPRITES}
+    backgrounds = {name: Image.open(SOURCE_DIR / file).convert("RGB") for name, file in BACKGROUNDS.items()}
+    source_bytes = sum((SOURCE_DIR / f"{name}.png").stat().st_size for name in SPRITES) + sum(
+        (SOURCE_DIR / file).stat().st_size for file in BACKGROUNDS.values()
+    )
+
+    manifest: dict = {"formats": formats, "variants": {}}
+    for scale in scales:
+        sprites = {
+            name: _resize(image, scale * SPRITES[name] / max(image.size)) for name, image in sources.items()
+        }
+        atlas, frames = pack(sprites)
+        variant = {
+            "atlas": {fmt: write_hashed(atlas, f"atlas@{scale}x", fmt) for fmt in formats},
+            "frames": frames,
+            "backgrounds": {},
+        }
+        for name, image in backgrounds.items():
+            # Smallest size that still covers the canvas, as drawCover() in engine.ts does.
+            cover = scale * max(CANVAS[0] / image.width, CANVAS[1] / image.height)
+            resized = _resize(image, cover)
+            variant["backgrounds"][name] = {
+                fmt: write_hashed(resized, f"background_{name}@{scale}x", fmt) for fmt in formats
+            }
+        manifest["variants"][f"{scale}x"] = variant
+
+    (OUTPUT_DIR / "manifest.json").write_text(json.dumps(manifest, separators=(",", ":")))
+
+    for scale in scales:
+        variant = manifest["variants"][f"{scale}x"]
+        files = [variant["atlas"][formats[0]], *(item[formats[0]] for item in variant["backgrounds"].values())]
+        size = sum((OUTPUT_DIR / file).stat().st_size for file in files)
+        print(f"@{scale}x {formats[0]}: {len(files)} files, {size / 1024:,.0f} KiB")
+    print(f"sources: {len(SPRITES) + len(BACKGROUNDS)} files, {source_bytes / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,14 @@
 import type {
   AccessStatus,
+  AdminOverviewResponse,
   AdminRequestItem,
-  AdminUserItem,
+  AdminSearchItem,
   AuthResponse,
+  BootstrapResponse,
   Difficulty,
+  JoinRequestStatus,
   LeaderboardEntry,
+  PercentileResponse,
 } from "../types/domain";
 
 class ApiError extends Error {
@@ -42,6 +46,17 @@ export const api = {
     });
   },
 
+  bootstrap(initData: string): Promise<BootstrapResponse> {
+    return request<BootstrapResponse>("/api/bootstrap", {
+      method: "POST",
+      body: JSON.stringify({ initData }),
+    });
+  },
+
+  refreshSession(): Promise<AuthResponse> {
+    return request<AuthResponse>("/api/auth/refresh", { method: "POST" });
+  },
+
   accessStatus(): Promise<AccessStatus> {
     return request<AccessStatus>("/api/access/status");
   },
@@ -53,10 +68,10 @@ export const api = {
     });
   },
 
-  submitScore(difficulty: Difficulty, score: number): Promise<{ ok: boolean }> {
-    return request<{ ok: boolean }>("/api/game/score", {
+  submitScore(difficulty: Difficulty, score: number, gameId: string): Promise<{ ok: boolean; duplicate: boolean }> {
+    return request<{ ok: boolean; duplicate: boolean }>("/api/game/score", {
       method: "POST",
-      body: JSON.stringify({ difficulty, score }),
+      body: JSON.stringify({ difficulty, score, game_id: gameId }),
     });
   },
 
@@ -64,12 +79,25 @@ export const api = {
     return request<LeaderboardEntry[]>(`/api/game/leaderboard?difficulty=${difficulty}`);
   },
 
-  adminRequests(): Promise<AdminRequestItem[]> {
-    return request<AdminRequestItem[]>("/api/admin/requests");
+  percentile(difficulty: Difficulty, score: number): Promise<PercentileResponse> {
+    return request<PercentileResponse>(`/api/game/percentile?difficulty=${difficulty}&score=${score}`);
+  },
+
+  adminRequests(status?: JoinRequestStatus, limit = 50): Promise<AdminRequestItem[]> {
+    const params = new URLSearchParams({ limit: String(limit), ...(status ? { status } : {}) });
+    return request<AdminRequestItem[]>(`/api/admin/requests?${params}`);
+  },
+
+  adminOverview(): Promise<AdminOverviewResponse> {
+    return request<AdminOverviewResponse>("/api/admin/overview");
+  },
+
+  adminSearch(q: string): Promise<AdminSearchItem[]> {
+    return request<AdminSearchItem[]>(`/api/admin/search?${new URLSearchParams({ q })}`);
   },
 
-  adminUsers(): Promise<AdminUserItem[]> {
-    return request<AdminUserItem[]>("/api/admin/users");
+  claimRequests(n: number): Promise<AdminRequestItem[]> {
+    return request<AdminRequestItem[]>(`/api/admin/requests/claim?n=${n}`, { method: "POST" });
   },
 
   approveRequest(requestId: number, reason?: string): Promise<{ ok: boolean }> {
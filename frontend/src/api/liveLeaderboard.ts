@@ -0,0 +1,20 @@
+import type { Difficulty, LiveLeaderboardEntry, LiveLeaderboardMessage } from "../types/domain";
+
+export function liveLeaderboardUrl(difficulty: Difficulty): string {
+  const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+  return `${protocol}//${window.location.host}/api/game/leaderboard/live?difficulty=${difficulty}`;
+}
+
+// Deltas carry every entry whose position changed, so untouched entries keep theirs.
+export function applyLeaderboardMessage(
+  entries: LiveLeaderboardEntry[],
+  message: LiveLeaderboardMessage,
+): LiveLeaderboardEntry[] {
+  if (message.type === "snapshot") {
+    return message.entries;
+  }
+  const replaced = new Set([...message.removed, ...message.entries.map((entry) => entry.user_id)]);
+  return [...entries.filter((entry) => !replaced.has(entry.user_id)), ...message.entries]
+    .sort((a, b) => a.position - b.position)
+    .slice(0, message.size);
+}
@@ -1,13 +1,14 @@
 import { createContext, useCallback, useContext, useEffect, useMemo, useState } from "react";
 
 import { ApiError, api } from "../api/client";
-import type { AccessStatus, AuthResponse } from "../types/domain";
+import type { AccessStatus, AuthResponse, BootstrapResponse } from "../types/domain";
 
 interface AuthState {
   loading: boolean;
   error: string | null;
   session: AuthResponse | null;
   access: AccessStatus | null;
+  leaderboards: BootstrapResponse["leaderboards"];
   refreshAccess: () => Promise<void>;
 }
 
@@ -20,11 +21,15 @@ function getTelegramInitData(): string {
   return fromTelegram || fromQuery || fromEnv || "";
 }
 
+// Slide the session cookie forward while the Mini App stays open.
+const SESSION_RENEW_INTERVAL_MS = 60 * 60 * 1000;
+
 export function AuthProvider({ children }: { children: React.ReactNode }): JSX.Element {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [session, setSession] = useState<AuthResponse | null>(null);
   const [access, setAccess] = useState<AccessStatus | null>(null);
+  const [leaderboards, setLeaderboards] = useState<BootstrapResponse["leaderboards"]>({});
 
   const refreshAccess = useCallback(async (): Promise<void> => {
     const accessStatus = await api.accessStatus();
@@ -44,10 +49,10 @@ export function AuthProvider({ children }: { children: React.ReactNode }): JSX.E
         window.Telegram?.WebApp?.ready();
         window.Telegram?.WebApp?.expand();
 
-        const auth = await api.authTelegram(initData);
+        const { access: accessStatus, leaderboards: initialLeaderboards, ...auth } = await api.bootstrap(initData);
         setSession(auth);
-        const accessStatus = await api.accessStatus();
         setAccess(accessStatus);
+        setLeaderboards(initialLeaderboards);
       } catch (err) {
         if (err instanceof ApiError) {
           setError(err.message);
@@ -62,15 +67,26 @@ export function AuthProvider({ children }: { children: React.ReactNode }): JSX.E
     void bootstrap();
   }, []);
 
+  useEffect(() => {
+    if (!session) {
+      return undefined;
+    }
+    const timer = window.setInterval(() => {
+      api.refreshSession().then(setSession).catch(() => undefined);
+    }, SESSION_RENEW_INTERVAL_MS);
+    return () => window.clearInterval(timer);
+  }, [session]);
+
   const value = useMemo<AuthState>(
     () => ({
       loading,
       error,
       session,
       access,
+      leaderboards,
       refreshAccess,
     }),
-    [loading, error, session, access, refreshAccess],
+    [loading, error, session, access, leaderboards, refreshAccess],
   );
 
   return <AuthContext.Provider value={value}>{children}</AuthContext.Provider>;
@@ -2,12 +2,33 @@ export interface GameAssets {
   backgroundMobile: HTMLImageElement;
   backgroundDesktop: HTMLImageElement;
   backgroundFallback: HTMLImageElement;
-  shipIdle: HTMLImageElement;
-  shipFire: HTMLImageElement;
+  shipIdle: HTMLImageElement | HTMLCanvasElement;
+  shipFire: HTMLImageElement | HTMLCanvasElement;
   asteroids: HTMLCanvasElement[];
 }
 
+type Frame = [number, number, number, number];
+type FormatFiles = Record<string, string>;
+
+interface ManifestVariant {
+  atlas: FormatFiles;
+  frames: Record<string, Frame>;
+  backgrounds: Record<"mobile" | "desktop", FormatFiles>;
+}
+
+// Written by scripts/build_game_assets.py.
+interface AssetManifest {
+  formats: string[];
+  variants: Record<string, ManifestVariant>;
+}
+
 const ASSET_BASE = "/game-assets";
+const BUILT_BASE = `${ASSET_BASE}/built`;
+// The game canvas draws at CSS pixel size, so only the 1x variant is built; larger ones
+// (build_game_assets.py --scales) only pay off once it renders at devicePixelRatio.
+const RENDER_SCALE = 1;
+const WEBP_PROBE = "data:image/webp;base64,UklGRhoAAABXRUJQVlA4TA0AAAAvAAAAEAcQERGIiP4HAA==";
+const ASTEROID_COUNT = 10;
 
 function loadImage(src: string): Promise<HTMLImageElement> {
   return new Promise((resolve, reject) => {
@@ -38,7 +59,7 @@ function mirrorCanvas(input: HTMLCanvasElement): HTMLCanvasElement {
   return out;
 }
 
-function extractPrimaryAsteroidSprite(image: HTMLImageElement): ExtractedAsteroid {
+function extractPrimaryAsteroidSprite(image: HTMLImageElement | HTMLCanvasElement): ExtractedAsteroid {
   const source = document.createElement("canvas");
   source.width = image.width;
   source.height = image.height;
@@ -243,30 +264,102 @@ function buildAsteroidPool(asteroids: ExtractedAsteroid[]): HTMLCanvasElement[]
   return [...base, ...mirrored];
 }
 
-let assetsPromise: Promise<GameAssets> | null = null;
+function asteroidName(index: number): string {
+  return `asteroid_${String(index + 1).padStart(2, "0")}`;
+}
 
-export function loadGameAssets(): Promise<GameAssets> {
-  if (assetsPromise) {
-    return assetsPromise;
+function cutFrame(atlas: HTMLImageElement, [x, y, width, height]: Frame): HTMLCanvasElement {
+  const out = document.createElement("canvas");
+  out.width = width;
+  out.height = height;
+  const ctx = out.getContext("2d");
+  if (!ctx) {
+    throw new Error("Unable to create canvas for atlas frame");
+  }
+  ctx.drawImage(atlas, x, y, width, height, 0, 0, width, height);
+  return out;
+}
+
+async function pickFormat(formats: string[]): Promise<string> {
+  for (const format of formats) {
+    if (format === "png") {
+      return format;
+    }
+    if (format === "webp" && (await loadImage(WEBP_PROBE).then(() => true, () => false))) {
+      return format;
+    }
   }
+  return "png";
+}
 
-  const asteroidFiles = Array.from({ length: 10 }, (_, idx) => `${ASSET_BASE}/asteroid_${String(idx + 1).padStart(2, "0")}.png`);
+function pickVariant(manifest: AssetManifest): ManifestVariant {
+  const scales = Object.keys(manifest.variants)
+    .map((key) => Number.parseFloat(key))
+    .sort((a, b) => a - b);
+  const scale = scales.find((value) => value >= RENDER_SCALE) ?? scales[scales.length - 1];
+  return manifest.variants[`${scale}x`];
+}
+
+async function loadBuiltAssets(manifest: AssetManifest): Promise<GameAssets> {
+  const variant = pickVariant(manifest);
+  const format = await pickFormat(manifest.formats);
+  const [atlas, backgroundMobile, backgroundDesktop] = await Promise.all([
+    loadImage(`${BUILT_BASE}/${variant.atlas[format]}`),
+    loadImage(`${BUILT_BASE}/${variant.backgrounds.mobile[format]}`),
+    loadImage(`${BUILT_BASE}/${variant.backgrounds.desktop[format]}`),
+  ]);
+  const asteroids = Array.from({ length: ASTEROID_COUNT }, (_, idx) => cutFrame(atlas, variant.frames[asteroidName(idx)]));
+
+  return {
+    backgroundMobile,
+    backgroundDesktop,
+    backgroundFallback: backgroundDesktop,
+    shipIdle: cutFrame(atlas, variant.frames.ship_idle),
+    shipFire: cutFrame(atlas, variant.frames.ship_fire),
+    asteroids: buildAsteroidPool(asteroids.map((sprite) => extractPrimaryAsteroidSprite(sprite))),
+  };
+}
+
+async function loadSourceAssets(): Promise<GameAssets> {
+  const asteroidFiles = Array.from({ length: ASTEROID_COUNT }, (_, idx) => `${ASSET_BASE}/${asteroidName(idx)}.png`);
 
-  assetsPromise = Promise.all([
+  const [backgroundMobile, backgroundDesktop, backgroundFallback, shipIdle, shipFire, asteroids] = await Promise.all([
     loadImage(`${ASSET_BASE}/background_mobile_9x16_1080x1920.png`),
     loadImage(`${ASSET_BASE}/background_desktop_16x9_1920x1080.png`),
     loadImage(`${ASSET_BASE}/background_full.png`),
     loadImage(`${ASSET_BASE}/ship_idle.png`),
     loadImage(`${ASSET_BASE}/ship_fire.png`),
     Promise.all(asteroidFiles.map((file) => loadImage(file))),
-  ]).then(([backgroundMobile, backgroundDesktop, backgroundFallback, shipIdle, shipFire, asteroids]) => ({
+  ]);
+
+  return {
     backgroundMobile,
     backgroundDesktop,
     backgroundFallback,
     shipIdle,
     shipFire,
     asteroids: buildAsteroidPool(asteroids.map((sprite) => extractPrimaryAsteroidSprite(sprite))),
-  }));
+  };
+}
+
+async function fetchManifest(): Promise<AssetManifest | null> {
+  try {
+    const response = await fetch(`${BUILT_BASE}/manifest.json`, { cache: "no-cache" });
+    return response.ok ? ((await response.json()) as AssetManifest) : null;
+  } catch {
+    return null;
+  }
+}
+
+let assetsPromise: Promise<GameAssets> | null = null;
+
+export function loadGameAssets(): Promise<GameAssets> {
+  if (assetsPromise) {
+    return assetsPromise;
+  }
+
+  // Without a build (e.g. plain `npm run dev`) the source PNGs are used directly.
+  assetsPromise = fetchManifest().then((manifest) => (manifest ? loadBuiltAssets(manifest) : loadSourceAssets()));
 
   return assetsPromise;
 }
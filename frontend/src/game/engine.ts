@@ -17,6 +17,15 @@ interface Asteroid {
   sprite: HTMLCanvasElement;
 }
 
+export interface GameStats {
+  durationMs: number;
+  deathMs: number | null;
+  shots: number;
+  hits: number;
+  asteroidsSpawned: number;
+  score: number;
+}
+
 export interface GameSnapshot {
   score: number;
   isGameOver: boolean;
@@ -77,6 +86,11 @@ export class SpaceShooterEngine {
   private moveX = 0;
   private shootPressed = false;
   private now = 0;
+  private elapsedMs = 0;
+  private deathMs: number | null = null;
+  private shots = 0;
+  private hits = 0;
+  private asteroidsSpawned = 0;
 
   private difficulty: Difficulty;
   private lastSpawnTime = 0;
@@ -113,6 +127,17 @@ export class SpaceShooterEngine {
     return { score: this.score, isGameOver: this.gameOver, isPaused: this.paused };
   }
 
+  stats(): GameStats {
+    return {
+      durationMs: Math.round(this.elapsedMs),
+      deathMs: this.deathMs === null ? null : Math.round(this.deathMs),
+      shots: this.shots,
+      hits: this.hits,
+      asteroidsSpawned: this.asteroidsSpawned,
+      score: this.score,
+    };
+  }
+
   start(onUpdate: (state: GameSnapshot) => void): void {
     let lastFrame = performance.now();
 
@@ -142,6 +167,7 @@ export class SpaceShooterEngine {
   private update(ts: number, deltaMs: number): void {
     const cfg = DIFFICULTY_CONFIG[this.difficulty];
     const frameScale = clamp(deltaMs / 16.67, 0.5, 2.2);
+    this.elapsedMs += deltaMs;
 
     this.shipX += this.moveX * cfg.shipSpeed * frameScale;
     this.shipX = clamp(this.shipX, 4, this.width - this.shipWidth - 4);
@@ -151,6 +177,7 @@ export class SpaceShooterEngine {
       this.bullets.push({ x: this.shipX + this.shipWidth * 0.36, y: bulletY, speed: cfg.bulletSpeed });
       this.bullets.push({ x: this.shipX + this.shipWidth * 0.64, y: bulletY, speed: cfg.bulletSpeed });
       this.lastShotTime = ts;
+      this.shots += 1;
     }
 
     if (ts - this.lastSpawnTime >= cfg.spawnMs) {
@@ -167,6 +194,7 @@ export class SpaceShooterEngine {
         sprite,
       });
       this.lastSpawnTime = ts;
+      this.asteroidsSpawned += 1;
     }
 
     for (const bullet of this.bullets) {
@@ -196,6 +224,7 @@ export class SpaceShooterEngine {
           this.bullets.splice(bulletIdx, 1);
           this.asteroids.splice(asteroidIdx, 1);
           this.score += scorePerHit;
+          this.hits += 1;
           destroyed = true;
           break;
         }
@@ -220,6 +249,7 @@ export class SpaceShooterEngine {
 
       if (distanceSquared(asteroid.x, asteroid.y, closestX, closestY) <= hitRadius * hitRadius) {
         this.gameOver = true;
+        this.deathMs = this.elapsedMs;
         break;
       }
     }
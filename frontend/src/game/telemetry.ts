@@ -0,0 +1,109 @@
+import type { Difficulty } from "../types/domain";
+import type { GameStats } from "./engine";
+
+// Must match backend/app/services/telemetry.py.
+const HEADER_SIZE = 8;
+const RECORD_SIZE = 44;
+const VERSION = 1;
+const BATCH_ZLIB = 0x01;
+const RECORD_DIED = 0x01;
+const DIFFICULTY_CODES: Record<Difficulty, number> = { easy: 0, normal: 1, hard: 2 };
+const FLUSH_AT = 5;
+const MAX_QUEUE = 200;
+
+interface TelemetryRecord {
+  gameId: string;
+  difficulty: Difficulty;
+  stats: GameStats;
+}
+
+let queue: TelemetryRecord[] = [];
+
+function encodeRecords(records: TelemetryRecord[]): Uint8Array {
+  const bytes = new Uint8Array(records.length * RECORD_SIZE);
+  const view = new DataView(bytes.buffer);
+  records.forEach(({ gameId, difficulty, stats }, index) => {
+    const offset = index * RECORD_SIZE;
+    const hex = gameId.replace(/-/g, "");
+    for (let i = 0; i < 16; i += 1) {
+      bytes[offset + i] = parseInt(hex.slice(i * 2, i * 2 + 2), 16);
+    }
+    view.setUint8(offset + 16, DIFFICULTY_CODES[difficulty]);
+    view.setUint8(offset + 17, stats.deathMs === null ? 0 : RECORD_DIED);
+    const values = [
+      stats.durationMs,
+      stats.deathMs ?? 0,
+      stats.shots,
+      stats.hits,
+      stats.asteroidsSpawned,
+      stats.score,
+    ];
+    values.forEach((value, field) => view.setInt32(offset + 20 + field * 4, value, true));
+  });
+  return bytes;
+}
+
+async function compress(bytes: Uint8Array): Promise<Uint8Array | null> {
+  if (typeof CompressionStream === "undefined") {
+    return null;
+  }
+  // "deflate" is the zlib format the backend expects.
+  const stream = new Blob([bytes]).stream().pipeThrough(new CompressionStream("deflate"));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+async function encodeBatch(records: TelemetryRecord[], compressBatch: boolean): Promise<Uint8Array> {
+  const payload = encodeRecords(records);
+  const compressed = compressBatch ? await compress(payload).catch(() => null) : null;
+  const body = compressed && compressed.length < payload.length ? compressed : payload;
+
+  const batch = new Uint8Array(HEADER_SIZE + body.length);
+  const view = new DataView(batch.buffer);
+  batch[0] = "S".charCodeAt(0);
+  batch[1] = "T".charCodeAt(0);
+  view.setUint8(2, VERSION);
+  view.setUint8(3, body === payload ? 0 : BATCH_ZLIB);
+  view.setUint32(4, records.length, true);
+  batch.set(body, HEADER_SIZE);
+  return batch;
+}
+
+export async function flushTelemetry(compressBatch = true): Promise<void> {
+  if (queue.length === 0) {
+    return;
+  }
+  const records = queue;
+  queue = [];
+  try {
+    const batch = await encodeBatch(records, compressBatch);
+    const response = await fetch("/api/game/telemetry", {
+      method: "POST",
+      credentials: "include",
+      keepalive: true,
+      headers: { "Content-Type": "application/octet-stream" },
+      body: batch,
+    });
+    if (response.status === 429 || response.status >= 500) {
+      queue = [...records, ...queue].slice(-MAX_QUEUE);
+    }
+  } catch {
+    queue = [...records, ...queue].slice(-MAX_QUEUE);
+  }
+}
+
+export function recordGame(gameId: string, difficulty: Difficulty, stats: GameStats): void {
+  if (stats.durationMs <= 0) {
+    return;
+  }
+  queue.push({ gameId, difficulty, stats });
+  if (queue.length >= FLUSH_AT) {
+    void flushTelemetry();
+  }
+}
+
+document.addEventListener("visibilitychange", () => {
+  if (document.visibilityState === "hidden") {
+    // The page may be frozen soon after this event, so send without waiting on compression.
+    void flushTelemetry(false);
+  }
+});
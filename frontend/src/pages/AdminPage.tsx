@@ -1,20 +1,33 @@
 import { useEffect, useState } from "react";
 
 import { ApiError, api } from "../api/client";
-import type { AdminRequestItem, AdminUserItem } from "../types/domain";
+import type { AdminOverviewResponse, AdminRequestItem, AdminSearchItem } from "../types/domain";
+
+// Matches the backend: shorter name terms cannot use the trigram indexes; digits still match a Telegram ID.
+const MIN_NAME_SEARCH_LENGTH = 3;
+const PENDING_REQUESTS_LIMIT = 50;
+
+function isSearchable(term: string): boolean {
+  return term.length >= MIN_NAME_SEARCH_LENGTH || /^\d+$/.test(term);
+}
 
 export function AdminPage(): JSX.Element {
   const [requests, setRequests] = useState<AdminRequestItem[]>([]);
-  const [users, setUsers] = useState<AdminUserItem[]>([]);
+  const [overview, setOverview] = useState<AdminOverviewResponse | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [query, setQuery] = useState("");
+  const [results, setResults] = useState<AdminSearchItem[]>([]);
 
   const loadData = async (): Promise<void> => {
     try {
       setLoading(true);
-      const [reqData, userData] = await Promise.all([api.adminRequests(), api.adminUsers()]);
+      const [reqData, overviewData] = await Promise.all([
+        api.adminRequests("PENDING", PENDING_REQUESTS_LIMIT),
+        api.adminOverview(),
+      ]);
       setRequests(reqData);
-      setUsers(userData);
+      setOverview(overviewData);
       setError(null);
     } catch (err) {
       if (err instanceof ApiError) {
@@ -31,6 +44,49 @@ export function AdminPage(): JSX.Element {
     void loadData();
   }, []);
 
+  useEffect(() => {
+    const term = query.trim().replace(/^@/, "");
+    if (!isSearchable(term)) {
+      setResults([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = window.setTimeout(() => {
+      api
+        .adminSearch(term)
+        .then((data) => {
+          if (!cancelled) {
+            setResults(data);
+          }
+        })
+        .catch((err: unknown) => {
+          if (!cancelled) {
+            setError(err instanceof ApiError ? err.message : "Search failed");
+          }
+        });
+    }, 250);
+    return () => {
+      cancelled = true;
+      window.clearTimeout(timer);
+    };
+  }, [query]);
+
+  const claimNext = async (): Promise<void> => {
+    try {
+      const claimed = await api.claimRequests(5);
+      if (claimed.length === 0) {
+        setError("No unclaimed pending requests");
+      }
+      await loadData();
+    } catch (err) {
+      if (err instanceof ApiError) {
+        setError(err.message);
+      } else {
+        setError("Failed to claim requests");
+      }
+    }
+  };
+
   const decide = async (requestId: number, action: "approve" | "reject"): Promise<void> => {
     const reason = window.prompt("Reason (optional):") ?? undefined;
     try {
@@ -53,9 +109,11 @@ export function AdminPage(): JSX.Element {
     return <main className="card"><p className="status">Loading admin panel...</p></main>;
   }
 
-  const pendingCount = requests.filter((item) => item.status === "PENDING").length;
-  const approvedCount = users.filter((item) => item.status === "APPROVED").length;
-  const rejectedCount = users.filter((item) => item.status === "REJECTED").length;
+  const pendingCount = overview?.pending_requests ?? 0;
+  const approvedCount = overview?.users_by_status.APPROVED ?? 0;
+  const rejectedCount = overview?.users_by_status.REJECTED ?? 0;
+  const today = overview?.days.find((item) => item.day === new Date().toISOString().slice(0, 10));
+  const gamesToday = today ? Object.values(today.games).reduce((sum, value) => sum + value, 0) : 0;
 
   return (
     <main className="card admin admin-grid">
@@ -73,11 +131,74 @@ export function AdminPage(): JSX.Element {
           <p>Rejected Users</p>
           <strong>{rejectedCount}</strong>
         </article>
+        <article className="metric">
+          <p>Games Today</p>
+          <strong>{gamesToday}</strong>
+        </article>
       </section>
       {error && <p className="error">{error}</p>}
 
       <section className="panel">
-        <h2>Join Requests</h2>
+        <h2>Search</h2>
+        <input
+          type="search"
+          placeholder="Username, name or Telegram ID"
+          value={query}
+          onChange={(event) => setQuery(event.target.value)}
+        />
+        {query.trim() && !isSearchable(query.trim().replace(/^@/, "")) && (
+          <p className="muted">Type at least {MIN_NAME_SEARCH_LENGTH} characters or a Telegram ID.</p>
+        )}
+        {results.length > 0 && (
+          <div className="table-wrap">
+            <table>
+              <thead>
+                <tr>
+                  <th>Telegram ID</th>
+                  <th>Username</th>
+                  <th>Name</th>
+                  <th>Status</th>
+                  <th>Action</th>
+                </tr>
+              </thead>
+              <tbody>
+                {results.map((item) => (
+                  <tr key={item.id}>
+                    <td>{item.telegram_id}</td>
+                    <td>{item.username ? `@${item.username}` : "-"}</td>
+                    <td>{`${item.first_name} ${item.last_name ?? ""}`.trim()}</td>
+                    <td>
+                      <span className={`status-pill status-${item.status.toLowerCase()}`}>{item.status}</span>
+                    </td>
+                    <td>
+                      {item.request_id !== null && item.request_status === "PENDING" ? (
+                        <div className="actions">
+                          <button className="btn primary" onClick={() => void decide(item.request_id!, "approve")}>
+                            Approve
+                          </button>
+                          <button className="btn danger" onClick={() => void decide(item.request_id!, "reject")}>
+                            Reject
+                          </button>
+                        </div>
+                      ) : (
+                        <span>-</span>
+                      )}
+                    </td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </div>
+        )}
+      </section>
+
+      <section className="panel">
+        <h2>Pending Requests</h2>
+        <div className="actions">
+          <button className="btn" onClick={() => void claimNext()}>
+            Claim next 5
+          </button>
+        </div>
         <div className="table-wrap">
           <table>
             <thead>
@@ -88,6 +209,7 @@ export function AdminPage(): JSX.Element {
                 <th>Name</th>
                 <th>Status</th>
                 <th>Comment</th>
+                <th>Claimed by</th>
                 <th>Action</th>
               </tr>
             </thead>
@@ -102,6 +224,11 @@ export function AdminPage(): JSX.Element {
                     <span className={`status-pill status-${item.status.toLowerCase()}`}>{item.status}</span>
                   </td>
                   <td>{item.comment ?? item.decision_reason ?? "-"}</td>
+                  <td>
+                    {item.status === "PENDING" && item.claimed_until && new Date(item.claimed_until) > new Date()
+                      ? item.claimed_by_admin_tg_id
+                      : "-"}
+                  </td>
                   <td>
                     {item.status === "PENDING" ? (
                       <div className="actions">
@@ -122,36 +249,6 @@ export function AdminPage(): JSX.Element {
           </table>
         </div>
       </section>
-
-      <section className="panel">
-        <h2>Users</h2>
-        <div className="table-wrap">
-          <table>
-            <thead>
-              <tr>
-                <th>Telegram ID</th>
-                <th>Username</th>
-                <th>Name</th>
-                <th>Status</th>
-                <th>Created</th>
-              </tr>
-            </thead>
-            <tbody>
-              {users.map((item) => (
-                <tr key={item.id}>
-                  <td>{item.telegram_id}</td>
-                  <td>{item.username ? `@${item.username}` : "-"}</td>
-                  <td>{`${item.first_name} ${item.last_name ?? ""}`.trim()}</td>
-                  <td>
-                    <span className={`status-pill status-${item.status.toLowerCase()}`}>{item.status}</span>
-                  </td>
-                  <td>{new Date(item.created_at).toLocaleString()}</td>
-                </tr>
-              ))}
-            </tbody>
-          </table>
-        </div>
-      </section>
     </main>
   );
 }
@@ -1,19 +1,43 @@
 import { type PointerEvent, useEffect, useMemo, useRef, useState } from "react";
 
 import { ApiError, api } from "../api/client";
+import { applyLeaderboardMessage, liveLeaderboardUrl } from "../api/liveLeaderboard";
+import { useAuth } from "../contexts/AuthContext";
 import { loadGameAssets, type GameAssets } from "../game/assets";
 import { SpaceShooterEngine } from "../game/engine";
-import type { Difficulty, LeaderboardEntry } from "../types/domain";
+import { recordGame } from "../game/telemetry";
+import type { Difficulty, LeaderboardEntry, LiveLeaderboardEntry, LiveLeaderboardMessage } from "../types/domain";
 
 const difficulties: Difficulty[] = ["easy", "normal", "hard"];
 const JOYSTICK_RADIUS = 42;
 const CANVAS_WIDTH = 390;
 const CANVAS_HEIGHT = 640;
+const SCORE_SUBMIT_ATTEMPTS = 3;
+const LIVE_RECONNECT_MAX_MS = 30_000;
+
+function isRetryable(err: unknown): boolean {
+  return !(err instanceof ApiError) || err.status >= 500;
+}
+
+function newGameId(): string {
+  if (typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID();
+  }
+  // Older WebViews (Safari < 15.4, Chrome < 92) lack randomUUID; build a v4 UUID by hand.
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0")).join("");
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
 
 export function PlayPage(): JSX.Element {
+  const { leaderboards: bootstrapLeaderboards } = useAuth();
+  const preloadedLeaderboardsRef = useRef(bootstrapLeaderboards);
   const canvasRef = useRef<HTMLCanvasElement | null>(null);
   const engineRef = useRef<SpaceShooterEngine | null>(null);
   const scoreSubmittedRef = useRef(false);
+  const liveConnectedRef = useRef(false);
   const joystickRef = useRef<HTMLDivElement | null>(null);
   const joystickPointerIdRef = useRef<number | null>(null);
   const firePointerIdRef = useRef<number | null>(null);
@@ -23,7 +47,8 @@ export function PlayPage(): JSX.Element {
   const [paused, setPaused] = useState(false);
   const [score, setScore] = useState(0);
   const [gameOver, setGameOver] = useState(false);
-  const [leaderboard, setLeaderboard] = useState<LeaderboardEntry[]>([]);
+  const [leaderboard, setLeaderboard] = useState<Array<LeaderboardEntry | LiveLeaderboardEntry>>([]);
+  const [beatPercent, setBeatPercent] = useState<number | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [assets, setAssets] = useState<GameAssets | null>(null);
   const [assetsLoading, setAssetsLoading] = useState(true);
@@ -49,7 +74,45 @@ export function PlayPage(): JSX.Element {
   };
 
   useEffect(() => {
-    void loadLeaderboard(difficulty);
+    // Boards delivered by /api/bootstrap are shown once, until the live snapshot arrives.
+    const preloaded = preloadedLeaderboardsRef.current[difficulty];
+    if (preloaded) {
+      preloadedLeaderboardsRef.current = { ...preloadedLeaderboardsRef.current, [difficulty]: undefined };
+      setLeaderboard(preloaded);
+    }
+
+    let socket: WebSocket | null = null;
+    let reconnectTimer: number | undefined;
+    let attempt = 0;
+    let stopped = false;
+    let entries: LiveLeaderboardEntry[] = [];
+
+    const connect = (): void => {
+      socket = new WebSocket(liveLeaderboardUrl(difficulty));
+      socket.onmessage = (event: MessageEvent<string>) => {
+        if (stopped) return;
+        attempt = 0;
+        liveConnectedRef.current = true;
+        entries = applyLeaderboardMessage(entries, JSON.parse(event.data) as LiveLeaderboardMessage);
+        setLeaderboard(entries);
+      };
+      socket.onclose = () => {
+        liveConnectedRef.current = false;
+        if (stopped) return;
+        // The server closes slow or surplus sockets; refetch once and reconnect for a fresh snapshot.
+        void loadLeaderboard(difficulty);
+        attempt += 1;
+        reconnectTimer = window.setTimeout(connect, Math.min(LIVE_RECONNECT_MAX_MS, 1000 * 2 ** attempt));
+      };
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      liveConnectedRef.current = false;
+      window.clearTimeout(reconnectTimer);
+      socket?.close();
+    };
   }, [difficulty]);
 
   useEffect(() => {
@@ -127,10 +190,27 @@ export function PlayPage(): JSX.Element {
     };
   }, []);
 
-  const saveScore = async (value: number): Promise<void> => {
+  const saveScore = async (value: number, gameId: string): Promise<void> => {
     try {
-      await api.submitScore(difficulty, value);
-      await loadLeaderboard(difficulty);
+      // Retries reuse the same game id, so the backend stores the run only once.
+      for (let attempt = 1; ; attempt += 1) {
+        try {
+          await api.submitScore(difficulty, value, gameId);
+          break;
+        } catch (err) {
+          if (attempt >= SCORE_SUBMIT_ATTEMPTS || !isRetryable(err)) {
+            throw err;
+          }
+          await new Promise((resolve) => window.setTimeout(resolve, 500 * 2 ** attempt));
+        }
+      }
+      if (!liveConnectedRef.current) {
+        await loadLeaderboard(difficulty);
+      }
+      api
+        .percentile(difficulty, value)
+        .then((result) => setBeatPercent(result.total_players > 1 ? result.percentile : null))
+        .catch(() => setBeatPercent(null));
     } catch (err) {
       if (err instanceof ApiError) {
         setError(err.message);
@@ -148,10 +228,12 @@ export function PlayPage(): JSX.Element {
     setError(null);
 
     setScore(0);
+    setBeatPercent(null);
     setGameOver(false);
     setPaused(false);
     setStarted(true);
     scoreSubmittedRef.current = false;
+    const gameId = newGameId();
 
     const engine = new SpaceShooterEngine(canvas, difficulty, assets);
     engineRef.current = engine;
@@ -163,7 +245,8 @@ export function PlayPage(): JSX.Element {
         engine.destroy();
         if (!scoreSubmittedRef.current) {
           scoreSubmittedRef.current = true;
-          void saveScore(snapshot.score);
+          void saveScore(snapshot.score, gameId);
+          recordGame(gameId, difficulty, engine.stats());
         }
       }
     });
@@ -273,6 +356,7 @@ export function PlayPage(): JSX.Element {
         <section className="panel">
           <h2>Game Over</h2>
           <p>Final score: {score}</p>
+          {beatPercent !== null && <p className="muted">Вы обошли {beatPercent}% пилотов</p>}
           <button className="btn primary" onClick={startGame}>
             Ещё раз
           </button>
@@ -39,6 +39,47 @@ export interface LeaderboardEntry {
   achieved_at: string;
 }
 
+export interface LiveLeaderboardEntry {
+  position: number;
+  rank: number;
+  user_id: number;
+  telegram_id: number;
+  username: string | null;
+  first_name: string;
+  score: number;
+}
+
+export interface LiveLeaderboardSnapshot {
+  type: "snapshot";
+  difficulty: Difficulty;
+  version: number;
+  entries: LiveLeaderboardEntry[];
+}
+
+export interface LiveLeaderboardDelta {
+  type: "delta";
+  difficulty: Difficulty;
+  version: number;
+  size: number;
+  entries: LiveLeaderboardEntry[];
+  removed: number[];
+}
+
+export type LiveLeaderboardMessage = LiveLeaderboardSnapshot | LiveLeaderboardDelta;
+
+export interface PercentileResponse {
+  difficulty: Difficulty;
+  score: number;
+  players_below: number;
+  total_players: number;
+  percentile: number;
+}
+
+export interface BootstrapResponse extends AuthResponse {
+  access: AccessStatus;
+  leaderboards: Partial<Record<Difficulty, LeaderboardEntry[]>>;
+}
+
 export interface AdminRequestItem {
   request_id: number;
   created_at: string;
@@ -49,6 +90,8 @@ export interface AdminRequestItem {
   username: string | null;
   first_name: string;
   last_name: string | null;
+  claimed_by_admin_tg_id: number | null;
+  claimed_until: string | null;
 }
 
 export interface AdminUserItem {
@@ -60,3 +103,20 @@ export interface AdminUserItem {
   status: UserStatus;
   created_at: string;
 }
+
+export interface AdminSearchItem extends AdminUserItem {
+  request_id: number | null;
+  request_status: JoinRequestStatus | null;
+}
+
+export interface OverviewDay {
+  day: string;
+  games: Record<Difficulty, number>;
+  active_players: Record<Difficulty, number>;
+}
+
+export interface AdminOverviewResponse {
+  pending_requests: number;
+  users_by_status: Record<UserStatus, number>;
+  days: OverviewDay[];
+}